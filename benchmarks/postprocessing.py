@@ -0,0 +1,100 @@
+import sys
+
+sys.path.append("../")
+
+import argparse, random, re, time
+from src.parse import _parse_size, _parse_brand, _parse_price, _parse_currency
+from src.vinted import postprocessing
+
+
+BRANDS = ["Zara", "zara ", "H&M", "Sézane", "Levi's", "levi's", "Nike", "Mango"]
+SIZES = ["XS / 34 / 6", "S / 36 / 8", "M / 38 / 10", "L / 40 / 12", "38,5", None]
+CURRENCIES = ["EUR", "EUR", "EUR", "PLN", "GBP"]
+RATES = {"PLN": 0.23, "GBP": 1.17}
+WHITESPACE = re.compile(r"\s+")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n_items", "-n", default=100_000, type=int)
+    parser.add_argument("--repeat", "-r", default=5, type=int)
+    return vars(parser.parse_args())
+
+
+def make_items(n_items: int):
+    rng = random.Random(0)
+
+    return [
+        {
+            "title": f"  Robe  {rng.choice(['lin', 'soie', 'coton'])}  {i % 500} ",
+            "brand_title": rng.choice(BRANDS),
+            "size_title": rng.choice(SIZES),
+            "price": {
+                "amount": f"{rng.lognormvariate(3, 0.6):.2f}",
+                "currency_code": rng.choice(CURRENCIES),
+            },
+            "catalog_id": rng.randint(1, 50),
+        }
+        for i in range(n_items)
+    ]
+
+
+def per_item(items):
+    rows = []
+
+    for item in items:
+        brand = _parse_brand(item).strip()
+        currency = _parse_currency(item)
+        price = _parse_price(item)
+
+        rows.append(
+            (
+                WHITESPACE.sub(" ", item.get("title")).strip(),
+                _parse_size(item),
+                brand.lower(),
+                len(brand) < postprocessing.BRAND_MAX_LENGTH,
+                price * (1.0 if currency == "EUR" else RATES.get(currency, 0.0)),
+            )
+        )
+
+    return rows
+
+
+def vectorized(items):
+    postprocessing.clean_titles([item.get("title") for item in items])
+    postprocessing.normalize_sizes([item.get("size_title") for item in items])
+    postprocessing.canonicalize_brands([item.get("brand_title") for item in items])
+    prices = postprocessing.convert_prices(
+        [_parse_price(item) for item in items],
+        [_parse_currency(item) for item in items],
+        RATES,
+    )
+    postprocessing.flag_outliers(prices, [item.get("catalog_id") for item in items])
+
+
+def best_of(function, items, repeat: int) -> float:
+    timings = []
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(items)
+        timings.append(time.perf_counter() - start)
+
+    return min(timings)
+
+
+def main(n_items: int, repeat: int):
+    items = make_items(n_items)
+
+    per_item_time = best_of(per_item, items, repeat)
+    vectorized_time = best_of(vectorized, items, repeat)
+
+    print(f"items: {n_items}")
+    print(f"per-item: {n_items / per_item_time:,.0f} items/s")
+    print(f"vectorized: {n_items / vectorized_time:,.0f} items/s")
+    print(f"speedup: {per_item_time / vectorized_time:.2f}x")
+
+
+if __name__ == "__main__":
+    kwargs = parse_args()
+    main(**kwargs)
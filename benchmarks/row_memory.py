@@ -0,0 +1,64 @@
+import sys
+
+sys.path.append("../")
+
+import argparse, gc, tracemalloc
+from src.parse import _parse_item
+from src.rows import to_json_rows
+
+
+def parse_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n_items", "-n", default=10_000, type=int)
+    return vars(parser.parse_args())
+
+
+def make_item(i: int) -> dict:
+    return {
+        "id": 5_000_000_000 + i,
+        "title": f"Robe vintage en lin {i}",
+        "url": f"https://www.vinted.fr/items/{5_000_000_000 + i}-robe-vintage",
+        "photo": {"url": f"https://images1.vinted.net/t/{i}/f800/photo.jpeg"},
+        "brand_title": "Sézane",
+        "size_title": "M / 38 / 10",
+        "status": "Très bon état",
+        "favourite_count": i % 50,
+        "price": {"amount": "24.90", "currency_code": "EUR"},
+    }
+
+
+def measure(n_items: int, as_dicts: bool) -> float:
+    items = [make_item(i) for i in range(n_items)]
+
+    gc.collect()
+    tracemalloc.start()
+
+    buffers = [[], [], [], []]
+
+    for item in items:
+        for buffer, entry in zip(buffers, _parse_item(item, catalog_id=1904)):
+            buffer.append(entry)
+
+    if as_dicts:
+        buffers = [to_json_rows(buffer) for buffer in buffers]
+
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return current / n_items
+
+
+def main(n_items: int):
+    dict_bytes = measure(n_items, as_dicts=True)
+    slots_bytes = measure(n_items, as_dicts=False)
+
+    print(f"items: {n_items}")
+    print(f"dict rows: {dict_bytes:.0f} bytes/item")
+    print(f"slotted rows: {slots_bytes:.0f} bytes/item")
+    print(f"ratio: {dict_bytes / slots_bytes:.2f}x")
+
+
+if __name__ == "__main__":
+    kwargs = parse_args()
+    main(**kwargs)
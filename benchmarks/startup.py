@@ -0,0 +1,90 @@
+import sys
+
+sys.path.append("../")
+
+from typing import List, Optional, Tuple
+import argparse, os, shutil, subprocess
+
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+STATEMENTS = {
+    "src": "import src",
+    "main": "import main",
+    "scraper": "import src.scraper",
+    "bigquery": "import src.bigquery",
+    "google": "import google.cloud.bigquery, google.oauth2.service_account",
+}
+
+
+def parse_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--top", "-t", default=10, type=int)
+    parser.add_argument("--image", "-i", default=None)
+    return vars(parser.parse_args())
+
+
+def import_times(statement: str) -> List[Tuple[str, int, int]]:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=ROOT_DIR,
+        capture_output=True,
+        text=True,
+    )
+
+    times = []
+
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+
+        self_us, cumulative_us, module = line[len("import time:") :].split("|")
+        times.append((module.rstrip(), int(self_us), int(cumulative_us)))
+
+    return times
+
+
+def _indent(module: str) -> int:
+    return len(module) - len(module.lstrip())
+
+
+def image_size(image: str) -> Optional[int]:
+    if not shutil.which("docker"):
+        return
+
+    result = subprocess.run(
+        ["docker", "image", "inspect", image, "--format", "{{.Size}}"],
+        capture_output=True,
+        text=True,
+    )
+
+    if result.returncode != 0:
+        return
+
+    return int(result.stdout.strip())
+
+
+def main(top: int, image: Optional[str] = None):
+    for name, statement in STATEMENTS.items():
+        times = import_times(statement)
+        total_ms = sum(self_us for _, self_us, _ in times) / 1000
+
+        print(f"{name}: {total_ms:.1f} ms ({len(times)} modules)")
+
+        depth = min((_indent(module) for module, _, _ in times), default=0)
+        heaviest = sorted(
+            (entry for entry in times if _indent(entry[0]) == depth),
+            key=lambda entry: entry[2],
+            reverse=True,
+        )
+
+        for module, _, cumulative_us in heaviest[:top]:
+            print(f"    {module.strip()}: {cumulative_us / 1000:.1f} ms")
+
+    if image:
+        size = image_size(image)
+        print(f"image {image}: {size / 1e6:.1f} MB" if size else f"image {image}: n/a")
+
+
+if __name__ == "__main__":
+    kwargs = parse_args()
+    main(**kwargs)
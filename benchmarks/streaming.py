@@ -0,0 +1,80 @@
+import sys
+
+sys.path.append("../")
+
+import argparse, json, random, time, tracemalloc
+from src.vinted.stream import iter_json_items
+
+
+def parse_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n_items", "-n", default=960, type=int)
+    parser.add_argument("--chunk_size", "-c", default=64 * 1024, type=int)
+    parser.add_argument("--repeat", "-r", default=20, type=int)
+    return vars(parser.parse_args())
+
+
+def make_body(n_items: int) -> bytes:
+    rng = random.Random(0)
+
+    items = [
+        {
+            "id": 4_000_000_000 + i,
+            "title": f"Robe {rng.choice(['lin', 'soie', 'coton'])} {i}",
+            "url": f"https://www.vinted.fr/items/{i}",
+            "brand_title": rng.choice(["Zara", "Sézane", "Levi's"]),
+            "size_title": "M / 38 / 10",
+            "favourite_count": rng.randint(0, 100),
+            "price": {"amount": f"{rng.uniform(3, 200):.2f}", "currency_code": "EUR"},
+            "photo": {"url": f"https://images.vinted.net/{i}.jpeg", "x": "y" * 800},
+            "user": {"id": rng.randint(1, 10_000), "login": "seller"},
+        }
+        for i in range(n_items)
+    ]
+
+    return json.dumps({"items": items, "pagination": {"total_pages": 1}}).encode()
+
+
+def chunked(body: bytes, chunk_size: int):
+    for i in range(0, len(body), chunk_size):
+        yield body[i : i + chunk_size]
+
+
+def full_decode(body: bytes, chunk_size: int) -> int:
+    data = json.loads(b"".join(chunked(body, chunk_size)))
+    return sum(1 for _ in data.get("items", []))
+
+
+def streaming(body: bytes, chunk_size: int) -> int:
+    return sum(1 for _ in iter_json_items(chunked(body, chunk_size)))
+
+
+def measure(fn, body: bytes, chunk_size: int, repeat: int):
+    start_time = time.perf_counter()
+    for _ in range(repeat):
+        n_items = fn(body, chunk_size)
+    elapsed = (time.perf_counter() - start_time) / repeat
+
+    tracemalloc.start()
+    fn(body, chunk_size)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return n_items, elapsed, peak
+
+
+def main(n_items: int, chunk_size: int, repeat: int):
+    body = make_body(n_items)
+    print(f"Body: {len(body) / 1024 / 1024:.2f} MiB | Items: {n_items}")
+
+    for name, fn in [("full decode", full_decode), ("streaming", streaming)]:
+        count, elapsed, peak = measure(fn, body, chunk_size, repeat)
+        print(
+            f"{name}: {count} items | {elapsed * 1000:.1f} ms | "
+            f"peak {peak / 1024 / 1024:.2f} MiB"
+        )
+
+
+if __name__ == "__main__":
+    kwargs = parse_args()
+    main(**kwargs)
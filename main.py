@@ -2,7 +2,8 @@ import sys
 
 sys.path.append("../")
 
-from typing import List, Tuple, Dict
+from typing import List, Tuple, Dict, Optional
+from concurrent.futures import ThreadPoolExecutor
 import json, os, argparse, random
 import src
 
@@ -11,6 +12,7 @@ DOMAIN = "fr"
 FILTER_BY_CHOICES = ["material", "patterns", "color"]
 REFERENCE_FIELD = "vinted_id"
 SHUFFLE_ALPHA = .4
+SUMMARY_SINKS = ["stdout", "jsonl"]
 
 
 def parse_args():
@@ -34,6 +36,94 @@ def parse_args():
         choices=FILTER_BY_CHOICES + ["None"],
         default="None",
     )
+    parser.add_argument(
+        "--sync_catalogs",
+        "-sc",
+        default=False,
+        type=lambda x: x.lower() == "true",
+    )
+    parser.add_argument(
+        "--domains",
+        "-d",
+        default=DOMAIN,
+        type=lambda x: [domain.strip() for domain in x.split(",") if domain.strip()],
+    )
+    parser.add_argument(
+        "--enrich",
+        "-e",
+        default=False,
+        type=lambda x: x.lower() == "true",
+    )
+    parser.add_argument(
+        "--track_changes",
+        "-tc",
+        default=False,
+        type=lambda x: x.lower() == "true",
+    )
+    parser.add_argument(
+        "--sweep_budget",
+        "-sb",
+        default=0,
+        type=int,
+    )
+    parser.add_argument(
+        "--image_dir",
+        "-id",
+        default=None,
+    )
+    parser.add_argument(
+        "--postprocess",
+        "-pp",
+        default=False,
+        type=lambda x: x.lower() == "true",
+    )
+    parser.add_argument(
+        "--crawl_budget",
+        "-cb",
+        default=0,
+        type=int,
+    )
+    parser.add_argument(
+        "--sink_dir",
+        "-sd",
+        default=None,
+    )
+    parser.add_argument(
+        "--workers",
+        "-wk",
+        default=1,
+        type=int,
+    )
+    parser.add_argument(
+        "--tune_page_size",
+        "-tp",
+        default=False,
+        type=lambda x: x.lower() == "true",
+    )
+    parser.add_argument(
+        "--stream",
+        "-st",
+        default=False,
+        type=lambda x: x.lower() == "true",
+    )
+    parser.add_argument(
+        "--summary_sinks",
+        "-ss",
+        default=SUMMARY_SINKS,
+        type=lambda x: [sink.strip() for sink in x.split(",") if sink.strip()],
+    )
+    parser.add_argument(
+        "--seed",
+        "-s",
+        default=None,
+        type=int,
+    )
+    parser.add_argument(
+        "--rate_limit",
+        "-rl",
+        default=None,
+        type=float,
+    )
     args = parser.parse_args()
 
     if args.filter_by == "None":
@@ -42,35 +132,28 @@ def parse_args():
     return vars(args)
 
 
-def initialize_clients() -> Tuple:
+def initialize_clients(
+    domains: List[str], rate_limit: Optional[float] = None
+) -> Tuple:
     secrets = json.loads(os.getenv("SECRETS_JSON"))
     gcp_credentials = secrets.get("GCP_CREDENTIALS")
 
     bq_client = src.bigquery.init_client(credentials_dict=gcp_credentials)
-    vinted_client = src.vinted.Vinted(domain=DOMAIN)
-
-    return bq_client, vinted_client
+    vinted_clients = {
+        domain: src.vinted.Vinted(
+            domain=domain, rate_limiter=src.vinted.RateLimiter(rate_limit)
+        )
+        for domain in domains
+    }
 
+    return bq_client, vinted_clients
 
-def get_dataloader(women: bool) -> List[List[Dict]]:
-    conditions = [
-        f"women = {women}",
-        "is_valid = TRUE",
-        "is_active = TRUE",
-    ]
 
-    kwargs = {
-        "client": bq_client,
-        "conditions": conditions,
-        "order_by": "RAND()",
-    }
+def get_dataloader(women: bool, rng: random.Random) -> List[List[Dict]]:
+    catalogs = src.cache.load_catalogs(bq_client)
 
-    if random.random() < SHUFFLE_ALPHA:
-        loader = src.bigquery.load_table(
-            table_id=src.enums.CATALOG_TABLE_ID,
-            dataset_id=src.enums.DATASET_ID,
-            **kwargs
-        )
+    if rng.random() < SHUFFLE_ALPHA:
+        loader = src.cache.filter_catalogs(catalogs, women, rng=rng)
 
         return [loader]
 
@@ -78,11 +161,8 @@ def get_dataloader(women: bool) -> List[List[Dict]]:
         loaders = []
 
         for importance_score in range(1, 4):
-            query = src.bigquery.query_catalogs_importance(importance_score)
-
-            loader = src.bigquery.load_table(
-                query=query,
-                **kwargs,
+            loader = src.cache.filter_catalogs(
+                catalogs, women, importance_score=importance_score, rng=rng
             )
 
             loaders.append(loader)
@@ -90,31 +170,301 @@ def get_dataloader(women: bool) -> List[List[Dict]]:
         return loaders
 
 
-def main(women: bool, only_vintage: bool, filter_by: str = None):
+def run_catalog_sync():
+    diff = src.catalog.sync_catalogs(bq_client, vinted_client)
+
+    if diff:
+        print(
+            f"New catalogs: {len(diff.new)} | "
+            f"Changed: {len(diff.changed)} | "
+            f"Removed: {len(diff.removed)}"
+        )
+        src.cache.refresh_catalog_snapshot(bq_client)
+
+    elif diff is None:
+        print("Failed to sync catalogs")
+
+
+def run_scrapers(
+    scrapers: List["src.scraper.VintedScraper"], catalogs: List[Dict], **kwargs
+):
+    if len(scrapers) == 1:
+        scrapers[0].run(catalogs=catalogs, **kwargs)
+        return
+
+    with ThreadPoolExecutor(max_workers=len(scrapers)) as executor:
+        futures = [
+            executor.submit(
+                scraper.run,
+                catalogs=scraper.rng.sample(catalogs, len(catalogs)),
+                position=position,
+                **kwargs,
+            )
+            for position, scraper in enumerate(scrapers)
+        ]
+
+        for future in futures:
+            future.result()
+
+
+def run_crawlers(crawlers: List["src.crawler.SellerCrawler"]):
+    if len(crawlers) == 1:
+        crawlers[0].run()
+        return
+
+    with ThreadPoolExecutor(max_workers=len(crawlers)) as executor:
+        futures = [executor.submit(crawler.run) for crawler in crawlers]
+
+        for future in futures:
+            future.result()
+
+
+def main(
+    women: bool,
+    only_vintage: bool,
+    filter_by: str = None,
+    sync_catalogs: bool = False,
+    domains: Optional[List[str]] = None,
+    rate_limit: Optional[float] = None,
+    enrich: bool = False,
+    track_changes: bool = False,
+    sweep_budget: int = 0,
+    image_dir: Optional[str] = None,
+    postprocess: bool = False,
+    crawl_budget: int = 0,
+    sink_dir: Optional[str] = None,
+    workers: int = 1,
+    tune_page_size: bool = False,
+    stream: bool = False,
+    summary_sinks: Optional[List[str]] = None,
+    seed: Optional[int] = None,
+):
     global bq_client, vinted_client
-    bq_client, vinted_client = initialize_clients()
+    domains = domains or [DOMAIN]
 
-    loaders = get_dataloader(women)
+    if seed is None:
+        seed = random.randrange(2**32)
 
-    for loader in loaders:
-        print(f"women: {women} | filter_by: {filter_by} | catalogs: {len(loader)}")
+    rng = random.Random(seed)
+    print(f"Seed: {seed}")
+
+    summary = src.summary.RunSummary(
+        seed=seed,
+        women=women,
+        only_vintage=only_vintage,
+        filter_by=filter_by,
+        domains=domains,
+        workers=workers,
+    )
+
+    bq_client, vinted_clients = initialize_clients(domains, rate_limit)
+    vinted_client = vinted_clients[domains[0]]
+    summary_sinks = src.summary.init_sinks(summary_sinks or SUMMARY_SINKS, bq_client)
+
+    fx_rates = None
+    if postprocess:
+        try:
+            from src.vinted.postprocessing import fetch_rates
+        except ImportError as e:
+            raise ImportError(
+                "--postprocess needs numpy: pip install -r requirements-extras.txt"
+            ) from e
+
+        try:
+            fx_rates = fetch_rates()
+        except Exception as e:
+            print(e)
+
+        print(f"FX rates: {len(fx_rates or {})}")
 
-        scraper = src.scraper.VintedScraper(
-            bq_client=bq_client,
-            vinted_client=vinted_client,
+    enricher = None
+    if enrich:
+        enricher = src.enrich.ItemEnricher(bq_client, domains)
+
+    if sync_catalogs:
+        with summary.stage("catalog_sync"):
+            run_catalog_sync()
+
+    tracker = None
+    if track_changes:
+        tracker = src.changes.ChangeTracker()
+        print(f"Tracked items: {tracker.load(bq_client)}")
+
+    image_fetcher = None
+    if image_dir:
+        image_fetcher = src.images.ImageFetcher(bq_client, image_dir)
+        print(f"Fetched items: {image_fetcher.load()}")
+
+    dead_letters = src.deadletter.DeadLetterQueue()
+    uploader = src.writer.UploadExecutor(bq_client)
+
+    tuner = None
+    if tune_page_size:
+        tuner = src.tuner.PageSizeTuner(rng=random.Random(rng.getrandbits(64)))
+        print(f"Tuned catalogs: {tuner.load()}")
+
+    sink = None
+    if sink_dir:
+        sink = src.sink.ColumnarSink(sink_dir)
+
+    with summary.stage("load_catalogs"):
+        loaders = get_dataloader(women, rng)
+
+    visited = src.state.VisitedSet()
+    all_scrapers, num_inserted = [], 0
+
+    frontiers = {}
+    if crawl_budget > 0:
+        frontiers = {domain: src.crawler.SellerFrontier() for domain in domains}
+
+    for loader in loaders:
+        print(
+            f"women: {women} | filter_by: {filter_by} | "
+            f"domains: {','.join(domains)} | catalogs: {len(loader)}"
         )
 
-        scraper.run(
-            catalogs=loader,
-            filter_by=filter_by,
-            only_vintage=only_vintage,
-            women=women,
+        scrapers = [
+            src.scraper.VintedScraper(
+                bq_client=bq_client,
+                vinted_client=vinted_clients[domain],
+                visited=visited,
+                tracker=tracker,
+                image_fetcher=image_fetcher,
+                dead_letters=dead_letters,
+                postprocess=postprocess,
+                fx_rates=fx_rates,
+                frontier=frontiers.get(domain),
+                sink=sink,
+                tuner=tuner,
+                stream=stream,
+                rng=random.Random(rng.getrandbits(64)),
+                uploader=uploader,
+            )
+            for domain in domains
+        ]
+        all_scrapers.extend(scrapers)
+
+        with summary.stage("scrape"):
+            run_scrapers(
+                scrapers,
+                catalogs=loader,
+                filter_by=filter_by,
+                only_vintage=only_vintage,
+                women=women,
+                workers=workers,
+            )
+
+        if crawl_budget > 0:
+            catalog_ids = {entry.get("id") for entry in loader}
+
+            crawlers = [
+                src.crawler.SellerCrawler(
+                    scraper, scraper.frontier, catalog_ids, budget=crawl_budget
+                )
+                for scraper in scrapers
+            ]
+
+            with summary.stage("crawl"):
+                run_crawlers(crawlers)
+
+            for scraper, crawler in zip(scrapers, crawlers):
+                print(
+                    f"Domain: {scraper.domain} | "
+                    f"Sellers: {crawler.num_sellers} | "
+                    f"Requests: {crawler.num_requests} | "
+                    f"Crawled: {crawler.num_uploaded}"
+                )
+
+        with summary.stage("retry"):
+            recovered = sum(scraper.retry_searches() for scraper in scrapers)
+            recovered_rows = scrapers[0].retry_rows()
+
+        print(
+            f"Recovered searches: {recovered} | "
+            f"Recovered rows: {recovered_rows} | "
+            f"Dead letters: {len(dead_letters)}"
         )
 
-        scraper.insert_from_staging()
+        scraper = scrapers[0]
+
+        with summary.stage("insert"):
+            scraper.insert_from_staging()
+
+        num_inserted += scraper.num_inserted
         print(f"Inserted: {scraper.num_inserted}")
 
-        scraper.reset_staging()
+        if tracker:
+            print(f"Changes: {tracker.num_changed}/{tracker.num_observed}")
+
+        if image_fetcher:
+            with summary.stage("images"):
+                image_fetcher.flush()
+
+            print(
+                f"Images: {image_fetcher.num_fetched} | "
+                f"Duplicates: {image_fetcher.num_duplicates}"
+            )
+
+        with summary.stage("reset_staging"):
+            scraper.reset_staging()
+
+    if enricher:
+        enricher.start(limit=src.enums.ENRICHMENT_LIMIT)
+
+    if sweep_budget > 0:
+        for domain in domains:
+            sweeper = src.sweeper.AvailabilitySweeper(
+                bq_client,
+                vinted_clients[domain],
+                budget=max(sweep_budget // len(domains), 1),
+            )
+
+            with summary.stage("sweep"):
+                sweeper.run(seen=visited)
+
+            print(
+                f"Domain: {domain} | "
+                f"Unavailable: {sweeper.num_unavailable}/{sweeper.num_requested}"
+            )
+
+    if tuner:
+        tuner.save()
+
+    if sink:
+        print(f"Sink: {sink.num_rows} rows | {sink.num_files} files")
+
+    with summary.stage("close"):
+        uploader.shutdown(wait=True)
+
+        if image_fetcher:
+            image_fetcher.close()
+
+        if enricher:
+            enricher.shutdown(wait=True)
+            print(
+                f"Enriched: {enricher.num_enriched}/{enricher.num_requested} | "
+                f"Tombstoned: {enricher.num_tombstoned}"
+            )
+
+    clients = list(vinted_clients.values())
+    if enricher:
+        clients.extend(enricher.vinted_clients.values())
+
+    run = summary.collect(all_scrapers, clients, num_inserted)
+    history = src.summary.load_history(summary_sinks, summary.params)
+
+    for summary_sink in summary_sinks:
+        summary_sink.write(run)
+
+    print(
+        f"Run: {run.run_id} | "
+        f"Duration: {run.duration:.0f}s | "
+        f"Requests: {run.n_requests} ({run.request_rate:.2f}/s) | "
+        f"Inserted: {run.n_inserted}"
+    )
+
+    for regression in src.summary.detect_regressions(run, history):
+        print(f"Regression: {regression}")
 
 
 if __name__ == "__main__":
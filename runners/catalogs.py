@@ -5,44 +5,78 @@ sys.path.append("../")
 
 
 import src
-import json, os
+import json, os, argparse
 
 
-def main():
+def parse_args():
+    parser = argparse.ArgumentParser()
+
+    parser.add_argument(
+        "--mode",
+        "-m",
+        choices=["sync", "full"],
+        default="sync",
+    )
+    parser.add_argument("--path", "-p", default=src.enums.CATALOG_SNAPSHOT_PATH)
+
+    return vars(parser.parse_args())
+
+
+def main(mode: str, path: str):
     secrets = json.loads(os.getenv("SECRETS_JSON"))
     gcp_credentials = secrets.get("GCP_CREDENTIALS")
 
     bq_client = src.bigquery.init_client(credentials_dict=gcp_credentials)
     vinted_client = src.vinted.Vinted(domain="fr")
 
-    bq_dataset = src.bigquery.load_table(
-        client=bq_client,
-        table_id=src.enums.CATALOG_TABLE_ID,
-    )
+    if mode == "sync":
+        diff = src.catalog.sync_catalogs(bq_client, vinted_client)
 
-    index = [entry["id"] for entry in bq_dataset]
+        if diff is None:
+            print("Failed to sync catalogs")
+            return
 
-    response = vinted_client.catalogs_list()
-    vinted_dataset = src.catalog.get_all_catalogs(response)
+        print(
+            f"New catalogs: {len(diff.new)} | "
+            f"Changed: {len(diff.changed)} | "
+            f"Removed: {len(diff.removed)}"
+        )
 
-    new_catalogs, bq_rows = [], []
+    else:
+        bq_dataset = src.bigquery.load_table(
+            client=bq_client,
+            table_id=src.enums.CATALOG_TABLE_ID,
+            dataset_id=src.enums.DATASET_ID,
+            fields=["id"],
+        )
 
-    for entry in vinted_dataset:
-        if entry.id not in index:
-            new_catalogs.append(entry)
-            bq_rows.append(entry.to_dict())
+        index = {entry["id"] for entry in bq_dataset}
 
-    print(f"New catalogs: {len(new_catalogs)}")
+        response = vinted_client.catalogs_list()
+        vinted_dataset = src.catalog.get_all_catalogs(response)
 
-    success = src.bigquery.upload(
-        client=bq_client,
-        dataset_id=src.enums.DATASET_ID,
-        table_id=src.enums.CATALOG_TABLE_ID,
-        rows=bq_rows,
-    )
+        bq_rows = [entry.to_dict() for entry in vinted_dataset if entry.id not in index]
+
+        print(f"New catalogs: {len(bq_rows)}")
+
+        if bq_rows:
+            result = src.bigquery.upload(
+                client=bq_client,
+                dataset_id=src.enums.DATASET_ID,
+                table_id=src.enums.CATALOG_TABLE_ID,
+                rows=bq_rows,
+            )
+
+            print(
+                f"Uploaded: {result.n_success} | "
+                f"Rejected: {len(result.rejected)} | "
+                f"Failed: {len(result.failed)}"
+            )
 
-    print(f"Upload: {success}")
+    catalogs = src.cache.refresh_catalog_snapshot(bq_client, path)
+    print(f"Snapshot: {len(catalogs)} catalogs")
 
 
 if __name__ == "__main__":
-    main()
+    kwargs = parse_args()
+    main(**kwargs)
@@ -0,0 +1,49 @@
+from typing import List
+
+import sys
+
+
+sys.path.append("../")
+
+
+import src
+import json, os, argparse
+
+
+def parse_args():
+    parser = argparse.ArgumentParser()
+
+    parser.add_argument("--limit", "-l", default=None, type=int)
+    parser.add_argument(
+        "--workers", "-w", default=src.enums.ENRICHMENT_WORKERS, type=int
+    )
+    parser.add_argument(
+        "--domains",
+        "-d",
+        default="fr",
+        type=lambda x: [domain.strip() for domain in x.split(",") if domain.strip()],
+    )
+    parser.add_argument(
+        "--rate_limit", "-rl", default=src.enums.ENRICHMENT_RATE_LIMIT, type=float
+    )
+
+    return vars(parser.parse_args())
+
+
+def main(limit: int, workers: int, domains: List[str], rate_limit: float):
+    secrets = json.loads(os.getenv("SECRETS_JSON"))
+    gcp_credentials = secrets.get("GCP_CREDENTIALS")
+
+    bq_client = src.bigquery.init_client(credentials_dict=gcp_credentials)
+
+    enricher = src.enrich.ItemEnricher(
+        bq_client, domains, workers=workers, rate_limit=rate_limit
+    )
+    num_enriched = enricher.run(limit=limit)
+
+    print(f"Enriched: {num_enriched}/{enricher.num_requested}")
+
+
+if __name__ == "__main__":
+    kwargs = parse_args()
+    main(**kwargs)
@@ -0,0 +1,52 @@
+import sys
+
+
+sys.path.append("../")
+
+
+import src
+import json, os, argparse, tempfile
+
+
+def parse_args():
+    parser = argparse.ArgumentParser()
+
+    parser.add_argument("--directory", "-d", required=True)
+    parser.add_argument("--table_id", "-t", default=src.enums.STAGING_ITEM_TABLE_ID)
+    parser.add_argument("--run_date", "-rd", default=None)
+    parser.add_argument(
+        "--format", "-f", choices=["parquet", "arrow"], default=src.enums.SINK_FORMAT
+    )
+
+    return vars(parser.parse_args())
+
+
+def main(directory: str, table_id: str, run_date: str, format: str):
+    sink = src.sink.ColumnarSink(directory, format=format)
+    table = sink.read(table_id, run_date)
+
+    if table is None:
+        print("No files to load")
+        return
+
+    secrets = json.loads(os.getenv("SECRETS_JSON"))
+    gcp_credentials = secrets.get("GCP_CREDENTIALS")
+
+    bq_client = src.bigquery.init_client(credentials_dict=gcp_credentials)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = src.sink.write_parquet(table, os.path.join(tmp_dir, "load.parquet"))
+
+        loaded = src.bigquery.load_file(
+            client=bq_client,
+            dataset_id=src.enums.DATASET_ID,
+            table_id=table_id,
+            path=path,
+        )
+
+    print(f"Rows: {table.num_rows} | Loaded: {loaded}")
+
+
+if __name__ == "__main__":
+    kwargs = parse_args()
+    main(**kwargs)
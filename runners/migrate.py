@@ -0,0 +1,43 @@
+import sys
+
+
+sys.path.append("../")
+
+
+import src
+import json, os, argparse
+
+
+def parse_args():
+    parser = argparse.ArgumentParser()
+
+    parser.add_argument(
+        "--dry_run",
+        "-dr",
+        default=False,
+        type=lambda x: x.lower() == "true",
+    )
+
+    return vars(parser.parse_args())
+
+
+def main(dry_run: bool):
+    if dry_run:
+        print("\n\n".join(src.schema.migrations()))
+        return
+
+    secrets = json.loads(os.getenv("SECRETS_JSON"))
+    gcp_credentials = secrets.get("GCP_CREDENTIALS")
+
+    bq_client = src.bigquery.init_client(credentials_dict=gcp_credentials)
+    applied = src.schema.migrate(bq_client)
+
+    if applied < 0:
+        print("Migration failed")
+    else:
+        print(f"Applied: {applied}/{len(src.schema.migrations())}")
+
+
+if __name__ == "__main__":
+    kwargs = parse_args()
+    main(**kwargs)
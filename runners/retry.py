@@ -0,0 +1,68 @@
+import sys
+
+
+sys.path.append("../")
+
+
+import src
+import json, os, argparse
+
+
+def parse_args():
+    parser = argparse.ArgumentParser()
+
+    parser.add_argument(
+        "--domains",
+        "-d",
+        default="fr",
+        type=lambda x: [domain.strip() for domain in x.split(",") if domain.strip()],
+    )
+    parser.add_argument(
+        "--force",
+        "-f",
+        default=False,
+        type=lambda x: x.lower() == "true",
+    )
+    parser.add_argument("--path", "-p", default=src.enums.DEAD_LETTER_PATH)
+
+    return vars(parser.parse_args())
+
+
+def main(domains: list, force: bool, path: str):
+    secrets = json.loads(os.getenv("SECRETS_JSON"))
+    gcp_credentials = secrets.get("GCP_CREDENTIALS")
+
+    bq_client = src.bigquery.init_client(credentials_dict=gcp_credentials)
+    dead_letters = src.deadletter.DeadLetterQueue(path)
+
+    print(f"Dead letters: {len(dead_letters)}")
+
+    scrapers = [
+        src.scraper.VintedScraper(
+            bq_client=bq_client,
+            vinted_client=src.vinted.Vinted(domain=domain),
+            dead_letters=dead_letters,
+        )
+        for domain in domains
+    ]
+
+    recovered = sum(scraper.retry_searches(force=force) for scraper in scrapers)
+    recovered_rows = scrapers[0].retry_rows(force=force)
+
+    for scraper in scrapers:
+        scraper.close()
+
+    scraper = scrapers[0]
+    scraper.insert_from_staging()
+
+    print(
+        f"Recovered searches: {recovered} | "
+        f"Recovered rows: {recovered_rows} | "
+        f"Inserted: {scraper.num_inserted} | "
+        f"Dead letters: {len(dead_letters)}"
+    )
+
+
+if __name__ == "__main__":
+    kwargs = parse_args()
+    main(**kwargs)
@@ -0,0 +1,44 @@
+import sys
+
+
+sys.path.append("../")
+
+
+import src
+import json, os, argparse
+
+
+def parse_args():
+    parser = argparse.ArgumentParser()
+
+    parser.add_argument("--budget", "-b", default=src.enums.SWEEP_BUDGET, type=int)
+    parser.add_argument("--workers", "-w", default=src.enums.SWEEP_WORKERS, type=int)
+    parser.add_argument("--rate_limit", "-rl", default=None, type=float)
+
+    return vars(parser.parse_args())
+
+
+def main(budget: int, workers: int, rate_limit: float):
+    secrets = json.loads(os.getenv("SECRETS_JSON"))
+    gcp_credentials = secrets.get("GCP_CREDENTIALS")
+
+    bq_client = src.bigquery.init_client(credentials_dict=gcp_credentials)
+    vinted_client = src.vinted.Vinted(
+        domain="fr", rate_limiter=src.vinted.RateLimiter(rate_limit)
+    )
+
+    sweeper = src.sweeper.AvailabilitySweeper(
+        bq_client, vinted_client, budget=budget, workers=workers
+    )
+    sweeper.run()
+
+    print(
+        f"Requested: {sweeper.num_requested} | "
+        f"Unavailable: {sweeper.num_unavailable} | "
+        f"Updated: {sweeper.num_updated}"
+    )
+
+
+if __name__ == "__main__":
+    kwargs = parse_args()
+    main(**kwargs)
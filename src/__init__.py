@@ -1 +1,36 @@
-from . import parse, utils, bigquery, enums, vinted, scraper, catalog
+import importlib
+
+
+__all__ = [
+    "parse",
+    "utils",
+    "bigquery",
+    "enums",
+    "vinted",
+    "scraper",
+    "catalog",
+    "cache",
+    "state",
+    "rows",
+    "enrich",
+    "changes",
+    "sweeper",
+    "images",
+    "deadletter",
+    "canonical",
+    "crawler",
+    "sink",
+    "tuner",
+    "summary",
+    "writer",
+    "schema",
+]
+
+
+def __getattr__(name: str):
+    if name in __all__:
+        module = importlib.import_module(f".{name}", __name__)
+        globals()[name] = module
+        return module
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
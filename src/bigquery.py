@@ -1,11 +1,18 @@
-from typing import List, Dict, Union, Optional
+from typing import List, Dict, Tuple, Union, Optional, Iterator, TYPE_CHECKING
 
-from google.oauth2 import service_account
-from google.cloud import bigquery
+import json, time, datetime
+import requests
+from dataclasses import dataclass, field
 from .enums import *
 
+if TYPE_CHECKING:
+    from google.cloud import bigquery
+
+
+def init_client(credentials_dict: Dict) -> "bigquery.Client":
+    from google.oauth2 import service_account
+    from google.cloud import bigquery
 
-def init_client(credentials_dict: Dict) -> bigquery.Client:
     credentials_dict["private_key"] = credentials_dict["private_key"].replace(
         "\\n", "\n"
     )
@@ -20,7 +27,7 @@ def init_client(credentials_dict: Dict) -> bigquery.Client:
 
 
 def load_table(
-    client: bigquery.Client,
+    client: "bigquery.Client",
     table_id: Optional[str] = None,
     dataset_id: Optional[str] = None,
     query: Optional[str] = None,
@@ -30,7 +37,7 @@ def load_table(
     descending: Optional[bool] = None,
     limit: int = None,
     to_list: bool = True,
-) -> Union[List[Dict], bigquery.table.RowIterator]:
+) -> Union[List[Dict], "bigquery.table.RowIterator"]:
     field_str = ", ".join(fields) if fields else "*"
 
     if table_id and dataset_id:
@@ -62,27 +69,226 @@ def load_table(
         return results
 
 
+@dataclass
+class UploadResult:
+    n_success: int = 0
+    rejected: List[Dict] = field(default_factory=list)
+    failed: List[Dict] = field(default_factory=list)
+    n_bytes: int = 0
+    backoff_time: float = 0.0
+
+    def __bool__(self) -> bool:
+        return not self.failed
+
+
 def upload(
-    client: bigquery.Client, dataset_id: str, table_id: str, rows: List[Dict]
-) -> bool:
+    client: "bigquery.Client",
+    dataset_id: str,
+    table_id: str,
+    rows: List[Dict],
+    max_retries: int = UPLOAD_MAX_RETRIES,
+    reject_table_id: Optional[str] = REJECT_TABLE_ID,
+) -> UploadResult:
+    table = f"{PROJECT_ID}.{dataset_id}.{table_id}"
+    result = UploadResult()
+
+    pending = []
+
+    for chunk, chunk_bytes in chunk_rows(rows):
+        pending.append(chunk)
+        result.n_bytes += chunk_bytes
+
+    for attempt in range(max_retries + 1):
+        retry, throttled = [], False
+
+        for index, chunk in enumerate(pending):
+            try:
+                errors = client.insert_rows_json(table=table, json_rows=chunk)
+            except Exception as e:
+                kind = upload_error_kind(e)
+
+                if kind == TOO_LARGE and len(chunk) > 1:
+                    middle = (len(chunk) + 1) // 2
+                    retry.extend([chunk[:middle], chunk[middle:]])
+                    continue
+
+                if kind == TOO_LARGE:
+                    result.rejected.append({"row": chunk[0], "reason": str(e)})
+                    continue
+
+                print(e)
+
+                if kind == TRANSIENT:
+                    retry.append(chunk)
+                    throttled = True
+                    continue
+
+                for failed_chunk in retry + pending[index:]:
+                    result.failed.extend(failed_chunk)
+
+                retry = []
+                break
+
+            retry_rows = []
+
+            for error in errors:
+                row = chunk[error.get("index")]
+                reasons = [entry.get("reason") for entry in error.get("errors", [])]
+
+                if all(reason in UPLOAD_RETRYABLE_REASONS for reason in reasons):
+                    retry_rows.append(row)
+                    throttled = throttled or any(
+                        reason != "stopped" for reason in reasons
+                    )
+                else:
+                    result.rejected.append(
+                        {
+                            "row": row,
+                            "reason": "; ".join(
+                                f"{entry.get('reason')}: {entry.get('message')}"
+                                for entry in error.get("errors", [])
+                            ),
+                        }
+                    )
+
+            result.n_success += len(chunk) - len(errors)
+
+            if retry_rows:
+                retry.append(retry_rows)
+
+        if not retry:
+            break
+
+        if attempt >= max_retries:
+            for failed_chunk in retry:
+                result.failed.extend(failed_chunk)
+            break
+
+        if throttled:
+            backoff_time = UPLOAD_RETRY_BACKOFF * 2**attempt
+            time.sleep(backoff_time)
+            result.backoff_time += backoff_time
+
+        pending = retry
+
+    if result.rejected and reject_table_id:
+        _upload_rejected(client, dataset_id, table_id, reject_table_id, result.rejected)
+
+    return result
+
+
+TRANSIENT = "transient"
+TOO_LARGE = "too_large"
+FATAL = "fatal"
+
+
+def upload_error_kind(error: Exception) -> str:
+    code = getattr(error, "code", None)
+
+    if code == UPLOAD_TOO_LARGE_CODE or (
+        code == 400 and "too large" in str(error).lower()
+    ):
+        return TOO_LARGE
+
+    if code in UPLOAD_RETRYABLE_CODES or isinstance(
+        error, (requests.exceptions.RequestException, ConnectionError, TimeoutError)
+    ):
+        return TRANSIENT
+
+    return FATAL
+
+
+def chunk_rows(
+    rows: List[Dict],
+    max_rows: int = UPLOAD_MAX_ROWS,
+    max_bytes: int = UPLOAD_MAX_BYTES,
+) -> Iterator[Tuple[List[Dict], int]]:
+    chunk, chunk_bytes = [], 0
+
+    for row in rows:
+        row_bytes = len(json.dumps(row, ensure_ascii=False, default=str)) + 1
+
+        if chunk and (len(chunk) >= max_rows or chunk_bytes + row_bytes > max_bytes):
+            yield chunk, chunk_bytes
+            chunk, chunk_bytes = [], 0
+
+        chunk.append(row)
+        chunk_bytes += row_bytes
+
+    if chunk:
+        yield chunk, chunk_bytes
+
+
+def _upload_rejected(
+    client: "bigquery.Client",
+    dataset_id: str,
+    table_id: str,
+    reject_table_id: str,
+    rejected: List[Dict],
+) -> None:
+    created_at = datetime.datetime.now().isoformat()
+
+    reject_rows = [
+        {
+            "table_id": table_id,
+            "row": json.dumps(entry["row"], ensure_ascii=False, default=str),
+            "reason": entry["reason"],
+            "created_at": created_at,
+        }
+        for entry in rejected
+    ]
+
+    for chunk, _ in chunk_rows(reject_rows):
+        try:
+            errors = client.insert_rows_json(
+                table=f"{PROJECT_ID}.{dataset_id}.{reject_table_id}", json_rows=chunk
+            )
+            if errors:
+                print(errors)
+        except Exception as e:
+            print(e)
+
+
+def load_file(
+    client: "bigquery.Client",
+    dataset_id: str,
+    table_id: str,
+    path: str,
+    source_format: str = "PARQUET",
+) -> int:
+    from google.cloud import bigquery
+
+    job_config = bigquery.LoadJobConfig(
+        source_format=source_format,
+        write_disposition=bigquery.WriteDisposition.WRITE_APPEND,
+    )
+
     try:
-        errors = client.insert_rows_json(
-            table=f"{PROJECT_ID}.{dataset_id}.{table_id}", json_rows=rows
-        )
-        return len(errors) == 0
+        with open(path, "rb") as file:
+            load_job = client.load_table_from_file(
+                file, f"{PROJECT_ID}.{dataset_id}.{table_id}", job_config=job_config
+            )
+
+        load_job.result()
+        return load_job.output_rows
+
     except Exception as e:
         print(e)
-        return False
+        return -1
 
 
 def insert_staging_rows(
-    client: bigquery.Client, dataset_id: str, table_id: str, reference_field: str
+    client: "bigquery.Client",
+    dataset_id: str,
+    table_id: str,
+    reference_field: str,
+    seed: int = 0,
 ) -> int:
     query = f"""
     INSERT INTO `{PROJECT_ID}.{dataset_id}.{table_id}`
     SELECT * FROM `{PROJECT_ID}.{dataset_id}.{table_id}_staging`
     WHERE {reference_field} NOT IN (SELECT {reference_field} FROM `{PROJECT_ID}.{dataset_id}.{table_id}`)
-    ORDER BY RAND()
+    ORDER BY FARM_FINGERPRINT(CONCAT('{seed}', {reference_field}))
     """
 
     try:
@@ -96,7 +302,7 @@ def insert_staging_rows(
 
 
 def reset_staging_table(
-    client: bigquery.Client, dataset_id: str, table_id: str, field_id: str
+    client: "bigquery.Client", dataset_id: str, table_id: str, field_id: str
 ) -> bool:
     query = f"""
     CREATE OR REPLACE TABLE `{PROJECT_ID}.{dataset_id}.{table_id}_staging` AS
@@ -111,6 +317,80 @@ def reset_staging_table(
         return False
 
 
+def update_catalogs(
+    client: "bigquery.Client", dataset_id: str, table_id: str, rows: List[Dict]
+) -> int:
+    from google.cloud import bigquery
+
+    query = f"""
+    MERGE `{PROJECT_ID}.{dataset_id}.{table_id}` AS t
+    USING UNNEST(@rows) AS s
+    ON t.id = s.id
+    WHEN MATCHED THEN UPDATE SET
+        title = s.title,
+        code = s.code,
+        url = s.url,
+        women = s.women,
+        parent_id = s.parent_id,
+        depth = s.depth,
+        hash = s.hash,
+        is_active = TRUE
+    """
+
+    parameters = [
+        bigquery.StructQueryParameter(
+            None,
+            bigquery.ScalarQueryParameter("id", "INT64", row["id"]),
+            bigquery.ScalarQueryParameter("title", "STRING", row["title"]),
+            bigquery.ScalarQueryParameter("code", "STRING", row["code"]),
+            bigquery.ScalarQueryParameter("url", "STRING", row["url"]),
+            bigquery.ScalarQueryParameter("women", "BOOL", row["women"]),
+            bigquery.ScalarQueryParameter("parent_id", "INT64", row["parent_id"]),
+            bigquery.ScalarQueryParameter("depth", "INT64", row["depth"]),
+            bigquery.ScalarQueryParameter("hash", "STRING", row["hash"]),
+        )
+        for row in rows
+    ]
+
+    job_config = bigquery.QueryJobConfig(
+        query_parameters=[bigquery.ArrayQueryParameter("rows", "STRUCT", parameters)]
+    )
+
+    try:
+        query_job = client.query(query, job_config=job_config)
+        query_job.result()
+        return query_job.num_dml_affected_rows
+
+    except Exception as e:
+        print(e)
+        return -1
+
+
+def deactivate_catalogs(
+    client: "bigquery.Client", dataset_id: str, table_id: str, ids: List[int]
+) -> int:
+    from google.cloud import bigquery
+
+    query = f"""
+    UPDATE `{PROJECT_ID}.{dataset_id}.{table_id}`
+    SET is_active = FALSE, hash = NULL
+    WHERE id IN UNNEST(@ids)
+    """
+
+    job_config = bigquery.QueryJobConfig(
+        query_parameters=[bigquery.ArrayQueryParameter("ids", "INT64", ids)]
+    )
+
+    try:
+        query_job = client.query(query, job_config=job_config)
+        query_job.result()
+        return query_job.num_dml_affected_rows
+
+    except Exception as e:
+        print(e)
+        return -1
+
+
 def query_catalogs_importance(importance_score: int) -> str:
     return f"""
     SELECT c.*
@@ -121,3 +401,107 @@ def query_catalogs_importance(importance_score: int) -> str:
     WHERE score = {importance_score}
     ) AS ci ON c.id = ci.catalog_id
     """
+
+
+def query_catalogs_snapshot() -> str:
+    return f"""
+    SELECT
+        c.id, c.title, c.code, c.url, c.women, c.parent_id, c.depth,
+        c.is_valid, c.is_active, ci.score AS importance_score
+    FROM `{PROJECT_ID}.{DATASET_ID}.{CATALOG_TABLE_ID}` AS c
+    LEFT JOIN `{PROJECT_ID}.{DATASET_ID}.{CATALOG_IMPORTANCE_TABLE_ID}` AS ci
+    ON c.id = ci.catalog_id
+    """
+
+
+def query_pending_enrichment(domains: List[str]) -> str:
+    domain_list = ", ".join(f"'{domain}'" for domain in domains)
+
+    return f"""
+    SELECT
+        i.vinted_id,
+        i.created_at,
+        COALESCE(i.domain, '{LEGACY_ITEM_DOMAIN}') AS domain
+    FROM `{PROJECT_ID}.{DATASET_ID}.{ITEM_TABLE_ID}` AS i
+    LEFT JOIN `{PROJECT_ID}.{DATASET_ID}.{ITEM_ENRICHMENT_TABLE_ID}` AS e
+    ON i.vinted_id = e.vinted_id
+    WHERE e.vinted_id IS NULL
+    AND COALESCE(i.domain, '{LEGACY_ITEM_DOMAIN}') IN ({domain_list})
+    """
+
+
+def query_last_item_states() -> str:
+    return f"""
+    WITH history AS (
+        SELECT vinted_id, price, favourite_count, is_available
+        FROM `{PROJECT_ID}.{DATASET_ID}.{PRICE_HISTORY_TABLE_ID}`
+        QUALIFY ROW_NUMBER() OVER (PARTITION BY vinted_id ORDER BY created_at DESC) = 1
+    ),
+    likes AS (
+        SELECT vinted_id, count
+        FROM `{PROJECT_ID}.{DATASET_ID}.{LIKES_TABLE_ID}`
+        QUALIFY ROW_NUMBER() OVER (PARTITION BY vinted_id ORDER BY created_at DESC) = 1
+    )
+    SELECT
+        i.vinted_id,
+        COALESCE(h.price, i.price) AS price,
+        COALESCE(h.favourite_count, l.count) AS favourite_count,
+        COALESCE(h.is_available, i.is_available) AS is_available
+    FROM `{PROJECT_ID}.{DATASET_ID}.{ITEM_TABLE_ID}` AS i
+    LEFT JOIN history AS h ON i.vinted_id = h.vinted_id
+    LEFT JOIN likes AS l ON i.vinted_id = l.vinted_id
+    """
+
+
+def query_sweep_candidates(domain: str) -> str:
+    return f"""
+    WITH likes AS (
+        SELECT vinted_id, count
+        FROM `{PROJECT_ID}.{DATASET_ID}.{LIKES_TABLE_ID}`
+        QUALIFY ROW_NUMBER() OVER (PARTITION BY vinted_id ORDER BY created_at DESC) = 1
+    )
+    SELECT
+        i.vinted_id,
+        (
+            UNIX_SECONDS(CURRENT_TIMESTAMP())
+            - COALESCE(UNIX_SECONDS(i.checked_at), i.unix_created_at)
+        ) * LOG(2 + COALESCE(l.count, 0)) AS priority
+    FROM `{PROJECT_ID}.{DATASET_ID}.{ITEM_TABLE_ID}` AS i
+    LEFT JOIN likes AS l ON i.vinted_id = l.vinted_id
+    WHERE i.is_available = TRUE
+    AND COALESCE(i.domain, '{LEGACY_ITEM_DOMAIN}') = '{domain}'
+    """
+
+
+def mark_checked(
+    client: "bigquery.Client",
+    dataset_id: str,
+    table_id: str,
+    vinted_ids: List[str],
+    unavailable_ids: List[str],
+) -> int:
+    from google.cloud import bigquery
+
+    query = f"""
+    UPDATE `{PROJECT_ID}.{dataset_id}.{table_id}`
+    SET
+        checked_at = CURRENT_TIMESTAMP(),
+        is_available = is_available AND vinted_id NOT IN UNNEST(@unavailable_ids)
+    WHERE vinted_id IN UNNEST(@vinted_ids)
+    """
+
+    job_config = bigquery.QueryJobConfig(
+        query_parameters=[
+            bigquery.ArrayQueryParameter("vinted_ids", "STRING", vinted_ids),
+            bigquery.ArrayQueryParameter("unavailable_ids", "STRING", unavailable_ids),
+        ]
+    )
+
+    try:
+        query_job = client.query(query, job_config=job_config)
+        query_job.result()
+        return query_job.num_dml_affected_rows
+
+    except Exception as e:
+        print(e)
+        return -1
@@ -0,0 +1,109 @@
+from typing import List, Dict, Optional, TYPE_CHECKING
+
+import os, time, random
+
+from .bigquery import load_table, query_catalogs_snapshot
+from .enums import CATALOG_SNAPSHOT_PATH, CATALOG_SNAPSHOT_TTL, CATALOG_SNAPSHOT_FIELDS
+
+if TYPE_CHECKING:
+    from google.cloud import bigquery
+
+
+def load_catalogs(
+    client: "bigquery.Client",
+    path: str = CATALOG_SNAPSHOT_PATH,
+    ttl: int = CATALOG_SNAPSHOT_TTL,
+) -> List[Dict]:
+    catalogs = load_catalog_snapshot(path, ttl)
+
+    if catalogs is None:
+        catalogs = refresh_catalog_snapshot(client, path)
+
+    return catalogs
+
+
+def refresh_catalog_snapshot(
+    client: "bigquery.Client", path: str = CATALOG_SNAPSHOT_PATH
+) -> List[Dict]:
+    catalogs = load_table(
+        client=client,
+        query=query_catalogs_snapshot(),
+        fields=CATALOG_SNAPSHOT_FIELDS,
+    )
+
+    save_catalog_snapshot(catalogs, path)
+
+    return catalogs
+
+
+def save_catalog_snapshot(
+    catalogs: List[Dict], path: str = CATALOG_SNAPSHOT_PATH
+) -> None:
+    snapshot = {
+        "created_at": int(time.time()),
+        "fields": CATALOG_SNAPSHOT_FIELDS,
+        "rows": [
+            [entry.get(field) for field in CATALOG_SNAPSHOT_FIELDS]
+            for entry in catalogs
+        ],
+    }
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    import msgpack
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as file:
+        file.write(msgpack.packb(snapshot, use_bin_type=True))
+
+    os.replace(tmp_path, path)
+
+
+def load_catalog_snapshot(
+    path: str = CATALOG_SNAPSHOT_PATH, ttl: Optional[int] = CATALOG_SNAPSHOT_TTL
+) -> Optional[List[Dict]]:
+    if not os.path.exists(path):
+        return
+
+    import msgpack
+
+    try:
+        with open(path, "rb") as file:
+            snapshot = msgpack.unpackb(file.read(), raw=False)
+    except Exception as e:
+        print(e)
+        return
+
+    if ttl is not None and time.time() - snapshot.get("created_at", 0) > ttl:
+        return
+
+    fields = snapshot.get("fields", [])
+
+    return [dict(zip(fields, row)) for row in snapshot.get("rows", [])]
+
+
+def filter_catalogs(
+    catalogs: List[Dict],
+    women: bool,
+    importance_score: Optional[int] = None,
+    shuffle: bool = True,
+    rng: Optional[random.Random] = None,
+) -> List[Dict]:
+    filtered = [
+        entry
+        for entry in catalogs
+        if entry.get("women") == women
+        and entry.get("is_valid")
+        and entry.get("is_active")
+        and (
+            importance_score is None
+            or entry.get("importance_score") == importance_score
+        )
+    ]
+
+    if shuffle:
+        (rng or random).shuffle(filtered)
+
+    return filtered
@@ -0,0 +1,99 @@
+from typing import List, Dict, Tuple, Optional, Hashable
+
+import re, sys, bisect, threading
+from functools import lru_cache
+
+from .enums import (
+    CANONICAL_CACHE_SIZE,
+    CANONICAL_MIN_PREFIX,
+    CANONICAL_MIN_PREFIX_RATIO,
+)
+
+
+BRAND = "brand"
+SIZE = "size"
+
+_NON_ALNUM = re.compile(r"[\W_]+")
+
+
+class CanonicalIndex:
+    def __init__(self, cache_size: int = CANONICAL_CACHE_SIZE):
+        self._entries: Dict[Hashable, Dict[str, Tuple[int, str]]] = {}
+        self._keys: Dict[Hashable, List[str]] = {}
+        self._lock = threading.Lock()
+        self._lookup = lru_cache(maxsize=cache_size)(self._match)
+
+    def update(self, filters: Dict, catalog_id: Optional[int] = None) -> int:
+        n_added = 0
+
+        with self._lock:
+            for kind, scope in [(BRAND, None), (SIZE, catalog_id)]:
+                options = filters.get(kind, {})
+                namespace = (kind, scope)
+                entries = self._entries.setdefault(namespace, {})
+                n_entries = len(entries)
+
+                for option_id, title in zip(
+                    options.get("id", []), options.get("title", [])
+                ):
+                    key = normalize_key(kind, title)
+
+                    if key and key not in entries:
+                        entries[key] = (option_id, title)
+
+                if len(entries) > n_entries:
+                    self._keys[namespace] = sorted(entries)
+                    n_added += len(entries) - n_entries
+
+            if n_added:
+                self._lookup.cache_clear()
+
+        return n_added
+
+    def brand(self, title: Optional[str]) -> Optional[Tuple[int, str]]:
+        return self._lookup(BRAND, None, title)
+
+    def size(
+        self, title: Optional[str], catalog_id: Optional[int] = None
+    ) -> Optional[Tuple[int, str]]:
+        return self._lookup(SIZE, catalog_id, title)
+
+    def _match(
+        self, kind: str, scope: Optional[int], title: Optional[str]
+    ) -> Optional[Tuple[int, str]]:
+        key = normalize_key(kind, title)
+        if not key:
+            return
+
+        namespace = (kind, scope)
+        entries = self._entries.get(namespace)
+        if not entries:
+            return
+
+        match = entries.get(key)
+        if match or kind != BRAND or len(key) < CANONICAL_MIN_PREFIX:
+            return match
+
+        keys = self._keys[namespace]
+        start = bisect.bisect_left(keys, key)
+        end = bisect.bisect_left(keys, key + "\uffff", lo=start)
+
+        if end - start == 1 and len(key) >= CANONICAL_MIN_PREFIX_RATIO * len(
+            keys[start]
+        ):
+            return entries[keys[start]]
+
+    def __len__(self) -> int:
+        return sum(len(entries) for entries in self._entries.values())
+
+
+def normalize_key(kind: str, title: Optional[str]) -> Optional[str]:
+    if not title:
+        return
+
+    if kind == SIZE:
+        title = title.split(" / ")[0].replace(",", ".")
+
+    key = _NON_ALNUM.sub("", title.casefold())
+
+    return sys.intern(key) if key else None
@@ -1,58 +1,209 @@
-from typing import List, Dict, Any
-
+from typing import (
+    List,
+    Dict,
+    Any,
+    Optional,
+    Iterator,
+    Iterable,
+    Tuple,
+    Container,
+    NamedTuple,
+    TYPE_CHECKING,
+)
+from dataclasses import dataclass, field
+from datetime import datetime
+
+from .vinted import Vinted
 from .vinted.models import VintedResponse, VintedCatalog
-from .enums import VALID_CATALOG_CODES
+from .vinted.enums import Domain
+from .bigquery import load_table, upload, update_catalogs, deactivate_catalogs
+from .enums import VALID_CATALOG_CODES, DATASET_ID, CATALOG_TABLE_ID
+
+if TYPE_CHECKING:
+    from google.cloud import bigquery
+
+
+class CatalogNode(NamedTuple):
+    catalog: Dict[str, Any]
+    path: Tuple[str, ...]
+    parent_ids: Tuple[int, ...]
+    depth: int
+
+
+@dataclass
+class CatalogDiff:
+    new: List[VintedCatalog] = field(default_factory=list)
+    changed: List[VintedCatalog] = field(default_factory=list)
+    removed: List[int] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.new or self.changed or self.removed)
+
+
+def sync_catalogs(
+    bq_client: "bigquery.Client",
+    vinted_client: Vinted,
+    dataset_id: str = DATASET_ID,
+    table_id: str = CATALOG_TABLE_ID,
+) -> Optional[CatalogDiff]:
+    response = vinted_client.catalogs_list()
+    if response.status_code != 200:
+        return
+
+    stored = load_table(
+        client=bq_client,
+        table_id=table_id,
+        dataset_id=dataset_id,
+        fields=["id", "hash", "is_active"],
+    )
+    active_ids = {entry["id"] for entry in stored if entry["is_active"]}
+    stored = {entry["id"]: entry["hash"] for entry in stored}
+
+    diff = diff_catalogs(iter_vinted_catalogs(response), stored, active_ids)
+
+    if diff.new:
+        result = upload(
+            client=bq_client,
+            dataset_id=dataset_id,
+            table_id=table_id,
+            rows=[entry.to_dict() for entry in diff.new],
+        )
+
+        if not result or result.n_success < len(diff.new):
+            print(f"Failed to insert {len(diff.new) - result.n_success} catalogs")
+            return
+
+    if diff.changed:
+        updated = update_catalogs(
+            client=bq_client,
+            dataset_id=dataset_id,
+            table_id=table_id,
+            rows=[entry.to_dict() for entry in diff.changed],
+        )
+
+        if updated < 0:
+            return
+
+    if diff.removed:
+        deactivated = deactivate_catalogs(
+            client=bq_client,
+            dataset_id=dataset_id,
+            table_id=table_id,
+            ids=diff.removed,
+        )
+
+        if deactivated < 0:
+            return
+
+    return diff
+
+
+def diff_catalogs(
+    catalogs: Iterable[VintedCatalog],
+    stored: Dict[int, Optional[str]],
+    active_ids: Optional[Container[int]] = None,
+) -> CatalogDiff:
+    diff = CatalogDiff()
+    seen = set()
+
+    for entry in catalogs:
+        if entry.id in seen:
+            continue
 
+        seen.add(entry.id)
 
-def get_all_catalogs(response: VintedResponse) -> List[Dict[str, Any]]:
-    iterator = response.data.get("dtos", {}).get("catalogs", [])
-    all_catalogs = []
+        if entry.id not in stored:
+            diff.new.append(entry)
+        elif stored[entry.id] != entry.hash:
+            diff.changed.append(entry)
 
-    for entry in iterator:
-        catalog_code = entry.get("code")
-        input_catalogs = []
+    diff.removed = [
+        id_
+        for id_ in stored
+        if id_ not in seen and (active_ids is None or id_ in active_ids)
+    ]
 
-        if catalog_code not in VALID_CATALOG_CODES:
-            continue
+    return diff
+
+
+def get_all_catalogs(
+    response: VintedResponse,
+    domain: Domain = "fr",
+    created_at: Optional[str] = None,
+) -> List[VintedCatalog]:
+    return list(iter_vinted_catalogs(response, domain, created_at))
+
+
+def iter_vinted_catalogs(
+    response: VintedResponse,
+    domain: Domain = "fr",
+    created_at: Optional[str] = None,
+) -> Iterator[VintedCatalog]:
+    created_at = created_at or datetime.now().isoformat()
 
-        if catalog_code == "DESIGNER_ROOT":
-            input_catalogs = entry.get("catalogs", [])
+    for node in iter_catalogs(response):
+        codes = node.path + (node.catalog.get("code"),)
 
+        if codes[0] == "DESIGNER_ROOT":
+            if node.depth == 0:
+                continue
+            is_women = "WOMEN" in codes[1]
         else:
-            input_catalogs = [entry]
+            is_women = "WOMEN" in codes[0]
 
-        for input_catalog in input_catalogs:
-            is_women = check_is_women(input_catalog)
-            unnested_catalogs = unnest(input_catalog)
+        yield parse(node, is_women, domain, created_at)
 
-            for unnested_catalog in unnested_catalogs:
-                all_catalogs.append(parse(unnested_catalog, is_women))
 
-    return all_catalogs
+def iter_catalogs(response: VintedResponse) -> Iterator[CatalogNode]:
+    for entry in response.data.get("dtos", {}).get("catalogs", []):
+        if entry.get("code") not in VALID_CATALOG_CODES:
+            continue
 
+        yield from walk(entry)
 
-def unnest(catalog: Dict[str, Any]) -> List[Dict[str, Any]]:
-    result = []
 
-    if "catalogs" in catalog and catalog["catalogs"]:
-        for subcatalog in catalog["catalogs"]:
-            result.extend(unnest(subcatalog))
+def walk(catalog: Dict[str, Any]) -> Iterator[CatalogNode]:
+    stack = [(catalog, (), ())]
+
+    while stack:
+        entry, path, parent_ids = stack.pop()
+        subcatalogs = entry.get("catalogs")
+
+        if subcatalogs:
+            path = path + (entry.get("code"),)
+            parent_ids = parent_ids + (entry.get("id"),)
+            stack.extend(
+                (subcatalog, path, parent_ids) for subcatalog in reversed(subcatalogs)
+            )
+
+        else:
+            yield CatalogNode(entry, path, parent_ids, len(parent_ids))
 
-    else:
-        result.append(catalog)
 
-    return result
+def unnest(catalog: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return [node.catalog for node in walk(catalog)]
 
 
 def check_is_women(catalog: Dict[str, Any]) -> bool:
     return "WOMEN" in catalog.get("code")
 
 
-def parse(entry: Dict[str, Any], is_women: bool) -> VintedCatalog:
+def parse(
+    node: CatalogNode,
+    is_women: bool,
+    domain: Domain = "fr",
+    created_at: Optional[str] = None,
+) -> VintedCatalog:
+    entry = node.catalog
+
     return VintedCatalog(
         id=entry.get("id"),
         title=entry.get("title"),
         code=entry.get("code"),
         url=entry.get("url"),
         women=is_women,
+        domain=domain,
+        parent_id=node.parent_ids[-1] if node.parent_ids else None,
+        depth=node.depth,
+        created_at=created_at,
     )
@@ -0,0 +1,139 @@
+from typing import Dict, Optional, Tuple, TYPE_CHECKING
+
+import threading, datetime
+
+from .rows import PriceHistoryRow
+from .parse import _parse_price, _parse_likes
+from .bigquery import load_table, query_last_item_states
+
+if TYPE_CHECKING:
+    from google.cloud import bigquery
+
+
+_LIKES_BITS = 20
+_UNKNOWN_LIKES = (1 << _LIKES_BITS) - 1
+
+
+def _price_slot(price: Optional[float]) -> int:
+    return 0 if price is None else int(round(price * 100)) + 1
+
+
+def pack_state(
+    price: Optional[float], favourite_count: Optional[int], is_available: bool
+) -> int:
+    price_slot = _price_slot(price)
+    likes_slot = (
+        _UNKNOWN_LIKES
+        if favourite_count is None
+        else min(max(favourite_count, 0), _UNKNOWN_LIKES - 1)
+    )
+
+    return (
+        (price_slot << (_LIKES_BITS + 1))
+        | (likes_slot << 1)
+        | int(bool(is_available))
+    )
+
+
+def unpack_state(state: int) -> Tuple[Optional[float], Optional[int], bool]:
+    price_slot = state >> (_LIKES_BITS + 1)
+    likes_slot = (state >> 1) & _UNKNOWN_LIKES
+
+    price = None if price_slot == 0 else (price_slot - 1) / 100
+    favourite_count = None if likes_slot == _UNKNOWN_LIKES else likes_slot
+
+    return price, favourite_count, bool(state & 1)
+
+
+class ChangeTracker:
+    def __init__(self):
+        self._states: Dict[int, int] = {}
+        self._lock = threading.Lock()
+
+        self.num_observed = 0
+        self.num_changed = 0
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+    def load(self, client: "bigquery.Client") -> int:
+        rows = load_table(
+            client=client,
+            query=query_last_item_states(),
+            to_list=False,
+        )
+
+        for row in rows:
+            try:
+                key = int(row["vinted_id"])
+            except (TypeError, ValueError):
+                continue
+
+            self._states[key] = pack_state(
+                row["price"], row["favourite_count"], row["is_available"]
+            )
+
+        return len(self._states)
+
+    def observe(self, item: Dict) -> Optional[PriceHistoryRow]:
+        try:
+            key = int(item.get("id"))
+        except (TypeError, ValueError):
+            return
+
+        price = _parse_price(item)
+        favourite_count = (
+            _parse_likes(item) if item.get("favourite_count") is not None else None
+        )
+        is_available = not item.get("is_closed", False)
+
+        with self._lock:
+            self.num_observed += 1
+            previous_state = self._states.get(key)
+
+            if previous_state is None:
+                self._states[key] = pack_state(price, favourite_count, is_available)
+                return
+
+            previous_price, previous_favourite_count, previous_is_available = (
+                unpack_state(previous_state)
+            )
+
+            price = price if price is not None else previous_price
+            if favourite_count is None:
+                favourite_count = previous_favourite_count
+
+            state = pack_state(price, favourite_count, is_available)
+
+            if state == previous_state:
+                return
+
+            self._states[key] = state
+
+            changed = (
+                (
+                    previous_price is not None
+                    and _price_slot(price) != _price_slot(previous_price)
+                )
+                or (
+                    previous_favourite_count is not None
+                    and favourite_count != previous_favourite_count
+                )
+                or is_available != previous_is_available
+            )
+
+            if not changed:
+                return
+
+            self.num_changed += 1
+
+        return PriceHistoryRow(
+            vinted_id=str(key),
+            price=price,
+            favourite_count=favourite_count,
+            is_available=is_available,
+            previous_price=previous_price,
+            previous_favourite_count=previous_favourite_count,
+            previous_is_available=previous_is_available,
+            created_at=datetime.datetime.now().isoformat(),
+        )
@@ -0,0 +1,120 @@
+from typing import List, Dict, Optional, Container, TYPE_CHECKING
+
+import heapq, threading
+from concurrent.futures import ThreadPoolExecutor
+
+from .vinted import VintedResponse
+from .state import VisitedSet
+from .parse import _parse_seller_id, _parse_likes
+from .enums import *
+
+if TYPE_CHECKING:
+    from .scraper import VintedScraper
+
+
+class SellerFrontier:
+    def __init__(self, visited: Optional[VisitedSet] = None):
+        self.visited = visited if visited is not None else VisitedSet()
+
+        self._heap = []
+        self._scores: Dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, item: Dict):
+        seller_id = _parse_seller_id(item)
+
+        if seller_id is not None and seller_id not in self.visited:
+            self.push(seller_id, 1 + _parse_likes(item))
+
+    def push(self, seller_id: int, score: int):
+        with self._lock:
+            score += self._scores.get(seller_id, 0)
+            self._scores[seller_id] = score
+            heapq.heappush(self._heap, (-score, seller_id))
+
+    def pop(self, n: int) -> List[int]:
+        seller_ids = []
+
+        with self._lock:
+            while self._heap and len(seller_ids) < n:
+                score, seller_id = heapq.heappop(self._heap)
+
+                if self._scores.get(seller_id) != -score:
+                    continue
+
+                del self._scores[seller_id]
+
+                if self.visited.add(seller_id):
+                    seller_ids.append(seller_id)
+
+        return seller_ids
+
+    def __len__(self) -> int:
+        return len(self._scores)
+
+
+class SellerCrawler:
+    def __init__(
+        self,
+        scraper: "VintedScraper",
+        frontier: SellerFrontier,
+        catalog_ids: Optional[Container[int]] = None,
+        budget: int = CRAWL_BUDGET,
+        workers: int = CRAWL_WORKERS,
+        max_pages: int = CRAWL_MAX_PAGES,
+        per_page: int = CRAWL_PER_PAGE,
+    ):
+        self.scraper = scraper
+        self.frontier = frontier
+        self.catalog_ids = catalog_ids
+        self.budget = budget
+        self.workers = workers
+        self.max_pages = max_pages
+        self.per_page = per_page
+
+        self._lock = threading.Lock()
+
+        self.num_sellers = 0
+        self.num_requests = 0
+        self.num_uploaded = 0
+
+    def run(self) -> int:
+        seller_ids = self.frontier.pop(self.budget)
+        self.num_sellers += len(seller_ids)
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            for responses in executor.map(self._fetch_wardrobe, seller_ids):
+                for response in responses:
+                    self.num_uploaded += self.scraper.ingest(
+                        response, self.catalog_ids
+                    )
+
+        return self.num_uploaded
+
+    def _fetch_wardrobe(self, seller_id: int) -> List[VintedResponse]:
+        responses = []
+
+        for page in range(1, self.max_pages + 1):
+            try:
+                response = self.scraper.vinted_client.user_items(
+                    seller_id, page=page, per_page=self.per_page
+                )
+            except Exception as e:
+                print(e)
+                break
+
+            with self._lock:
+                self.num_requests += 1
+
+            if response.status_code != 200 or not isinstance(response.data, dict):
+                break
+
+            responses.append(response)
+
+            items = response.data.get("items", [])
+            total_pages = response.data.get("pagination", {}).get("total_pages", 0)
+
+            if not items or page >= total_pages:
+                break
+
+        return responses
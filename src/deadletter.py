@@ -0,0 +1,159 @@
+from typing import List, Dict, Optional, NamedTuple
+
+import os, json, time, sqlite3, threading
+
+from .enums import (
+    DEAD_LETTER_PATH,
+    DEAD_LETTER_MAX_ATTEMPTS,
+    DEAD_LETTER_BACKOFF,
+    DEAD_LETTER_MAX_BACKOFF,
+)
+
+
+SEARCH = "search"
+ROWS = "rows"
+
+
+class DeadLetter(NamedTuple):
+    id: int
+    kind: str
+    domain: Optional[str]
+    payload: Dict
+    attempts: int
+
+
+class DeadLetterQueue:
+    def __init__(
+        self,
+        path: str = DEAD_LETTER_PATH,
+        max_attempts: int = DEAD_LETTER_MAX_ATTEMPTS,
+        backoff: float = DEAD_LETTER_BACKOFF,
+        max_backoff: float = DEAD_LETTER_MAX_BACKOFF,
+    ):
+        self.path = path
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(
+            path, check_same_thread=False, isolation_level=None
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS dead_letters (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                kind TEXT NOT NULL,
+                domain TEXT,
+                payload TEXT NOT NULL,
+                reason TEXT,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                next_attempt_at REAL NOT NULL,
+                created_at REAL NOT NULL
+            )
+            """
+        )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS dead_letters_due "
+            "ON dead_letters (kind, next_attempt_at)"
+        )
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection.execute(
+                "SELECT COUNT(*) FROM dead_letters WHERE attempts < ?",
+                (self.max_attempts,),
+            ).fetchone()[0]
+
+    def push_search(
+        self, domain: str, payload: Dict, reason: Optional[str] = None
+    ) -> int:
+        return self._push(SEARCH, domain, payload, reason)
+
+    def push_rows(
+        self, table_id: str, rows: List[Dict], reason: Optional[str] = None
+    ) -> int:
+        return self._push(ROWS, None, {"table_id": table_id, "rows": rows}, reason)
+
+    def due(
+        self,
+        kind: str,
+        domain: Optional[str] = None,
+        limit: Optional[int] = None,
+        force: bool = False,
+    ) -> List[DeadLetter]:
+        query = "SELECT id, kind, domain, payload, attempts FROM dead_letters"
+        query += " WHERE kind = ? AND attempts < ?"
+        params = [kind, self.max_attempts]
+
+        if domain is not None:
+            query += " AND domain = ?"
+            params.append(domain)
+
+        if not force:
+            query += " AND next_attempt_at <= ?"
+            params.append(time.time())
+
+        query += " ORDER BY id"
+
+        if limit:
+            query += " LIMIT ?"
+            params.append(limit)
+
+        with self._lock:
+            rows = self._connection.execute(query, params).fetchall()
+
+        return [
+            DeadLetter(id_, kind_, domain_, json.loads(payload), attempts)
+            for id_, kind_, domain_, payload, attempts in rows
+        ]
+
+    def ack(self, entry: DeadLetter):
+        with self._lock:
+            self._connection.execute(
+                "DELETE FROM dead_letters WHERE id = ?", (entry.id,)
+            )
+
+    def nack(self, entry: DeadLetter, reason: Optional[str] = None):
+        attempts = entry.attempts + 1
+
+        with self._lock:
+            self._connection.execute(
+                "UPDATE dead_letters "
+                "SET attempts = ?, next_attempt_at = ?, reason = ? WHERE id = ?",
+                (attempts, time.time() + self._delay(attempts), reason, entry.id),
+            )
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+    def _push(
+        self, kind: str, domain: Optional[str], payload: Dict, reason: Optional[str]
+    ) -> int:
+        now = time.time()
+
+        with self._lock:
+            cursor = self._connection.execute(
+                "INSERT INTO dead_letters "
+                "(kind, domain, payload, reason, next_attempt_at, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    kind,
+                    domain,
+                    json.dumps(payload, ensure_ascii=False),
+                    reason,
+                    now + self._delay(0),
+                    now,
+                ),
+            )
+
+        return cursor.lastrowid
+
+    def _delay(self, attempts: int) -> float:
+        return min(self.backoff * 2**attempts, self.max_backoff)
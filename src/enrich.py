@@ -0,0 +1,140 @@
+from typing import List, Dict, Optional, TYPE_CHECKING
+
+import threading, datetime
+from itertools import repeat
+from concurrent.futures import ThreadPoolExecutor, Future
+
+from .vinted import Vinted, RateLimiter
+from .parse import parse_item_info
+from .rows import ItemEnrichmentRow, to_json_rows
+from .bigquery import load_table, upload, query_pending_enrichment
+from .utils import create_batches
+from .enums import *
+
+if TYPE_CHECKING:
+    from google.cloud import bigquery
+
+
+MISSING = "missing"
+INVALID = "invalid"
+
+
+class ItemEnricher:
+    def __init__(
+        self,
+        bq_client: "bigquery.Client",
+        domains: List[str],
+        workers: int = ENRICHMENT_WORKERS,
+        batch_size: int = ENRICHMENT_BATCH_SIZE,
+        rate_limit: Optional[float] = ENRICHMENT_RATE_LIMIT,
+    ):
+        self.bq_client = bq_client
+        self.vinted_clients = {
+            domain: Vinted(domain=domain, rate_limiter=RateLimiter(rate_limit))
+            for domain in domains
+        }
+        self.workers = workers
+        self.batch_size = batch_size
+
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._lock = threading.Lock()
+
+        self.num_requested = 0
+        self.num_enriched = 0
+        self.num_tombstoned = 0
+
+    def start(self, limit: Optional[int] = None) -> Future:
+        return self._executor.submit(self.run, limit=limit)
+
+    def shutdown(self, wait: bool = True):
+        self._executor.shutdown(wait=wait)
+
+    def run(
+        self,
+        vinted_ids: Optional[Dict[str, List[str]]] = None,
+        limit: Optional[int] = None,
+    ) -> int:
+        if vinted_ids is None:
+            vinted_ids = self.load_pending(limit)
+
+        num_enriched, num_tombstoned = 0, 0
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            for domain, batch in self._batches(vinted_ids):
+                vinted_client = self.vinted_clients[domain]
+                rows = executor.map(self._fetch, repeat(vinted_client), batch)
+                rows = [row for row in rows if row]
+
+                if rows:
+                    result = upload(
+                        client=self.bq_client,
+                        dataset_id=DATASET_ID,
+                        table_id=ITEM_ENRICHMENT_TABLE_ID,
+                        rows=to_json_rows(rows),
+                    )
+                    n_tombstones = min(
+                        sum(row.status in (MISSING, INVALID) for row in rows),
+                        result.n_success,
+                    )
+                    num_enriched += result.n_success - n_tombstones
+                    num_tombstoned += n_tombstones
+
+        with self._lock:
+            self.num_enriched += num_enriched
+            self.num_tombstoned += num_tombstoned
+
+        return num_enriched
+
+    def load_pending(self, limit: Optional[int] = None) -> Dict[str, List[str]]:
+        rows = load_table(
+            client=self.bq_client,
+            query=query_pending_enrichment(list(self.vinted_clients)),
+            fields=["vinted_id", "domain"],
+            order_by="created_at",
+            descending=True,
+            limit=limit,
+        )
+
+        vinted_ids = {domain: [] for domain in self.vinted_clients}
+
+        for row in rows:
+            if row["domain"] in vinted_ids:
+                vinted_ids[row["domain"]].append(row["vinted_id"])
+
+        return vinted_ids
+
+    def _batches(self, vinted_ids: Dict[str, List[str]]):
+        for domain, domain_ids in vinted_ids.items():
+            if domain not in self.vinted_clients:
+                print(f"No client for domain {domain}, skipping {len(domain_ids)}")
+                continue
+
+            for batch in create_batches(domain_ids, self.batch_size):
+                yield domain, batch
+
+    def _fetch(
+        self, vinted_client: Vinted, vinted_id: str
+    ) -> Optional[ItemEnrichmentRow]:
+        with self._lock:
+            self.num_requested += 1
+
+        try:
+            response = vinted_client.item_info(vinted_id)
+        except Exception as e:
+            print(e)
+            return
+
+        row = parse_item_info(response, vinted_id)
+
+        if row is None and response.status_code in (200, 404):
+            row = ItemEnrichmentRow(
+                vinted_id=vinted_id,
+                seller_id=None,
+                description=None,
+                attributes=None,
+                uploaded_at=None,
+                created_at=datetime.datetime.now().isoformat(),
+                status=MISSING if response.status_code == 404 else INVALID,
+            )
+
+        return row
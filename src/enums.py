@@ -11,16 +11,107 @@ IMAGE_TABLE_ID = "image"
 CATEGORY_TABLE_ID = "category"
 LIKES_TABLE_ID = "likes"
 ITEM_DETAILS_TABLE_ID = "item_details"
+ITEM_ENRICHMENT_TABLE_ID = "item_enrichment"
+PRICE_HISTORY_TABLE_ID = "price_history"
+IMAGE_BLOB_TABLE_ID = "image_blob"
+REJECT_TABLE_ID = "reject"
+RUNS_TABLE_ID = "runs"
+
+LEGACY_ITEM_DOMAIN = "fr"
 
 STAGING_ITEM_TABLE_ID = "item_staging"
 STAGING_IMAGE_TABLE_ID = "image_staging"
 
 VALID_CATALOG_CODES = ["WOMEN_ROOT", "MENS", "DESIGNER_ROOT"]
 
-CATALOG_FIELDS = ["id", "title", "code", "url", "women"]
-VALID_FILTER_KEYS = ["brand", "color", "material", "patterns"]
+CATALOG_FIELDS = ["id", "title", "code", "url", "women", "parent_id", "depth"]
+VALID_FILTER_KEYS = ["brand", "color", "material", "patterns", "size"]
 
 DESIGNER_CATALOG_IDS = [2984, 2985, 2986, 2987, 2990, 2991, 2992]
 VINTAGE_BRAND_ID = 14803
 
 MAX_BRAND_TITLE_LENGTH = 35
+
+CANONICAL_CACHE_SIZE = 65536
+CANONICAL_MIN_PREFIX = 4
+CANONICAL_MIN_PREFIX_RATIO = 0.6
+
+STATE_SHARDS = 16
+
+PAGE_SIZE_TUNER_PATH = "cache/page_sizes.json"
+PAGE_SIZE_CANDIDATES = [96, 240, 480, 960]
+PAGE_SIZE_EXPLORE = 0.1
+PAGE_SIZE_DECAY = 0.3
+
+CATALOG_SNAPSHOT_PATH = "snapshot/catalogs.msgpack"
+CATALOG_SNAPSHOT_TTL = 25 * 60 * 60
+CATALOG_SNAPSHOT_FIELDS = CATALOG_FIELDS + ["is_valid", "is_active", "importance_score"]
+
+ENRICHMENT_WORKERS = 4
+ENRICHMENT_BATCH_SIZE = 500
+ENRICHMENT_LIMIT = 5000
+ENRICHMENT_RATE_LIMIT = 2.0
+ENRICHMENT_ATTRIBUTE_KEYS = [
+    "brand_id",
+    "size_id",
+    "status_id",
+    "color1_id",
+    "color2_id",
+    "material_id",
+    "package_size_id",
+    "view_count",
+    "favourite_count",
+    "is_closed",
+    "is_reserved",
+    "is_hidden",
+]
+
+SWEEP_BUDGET = 2000
+SWEEP_WORKERS = 8
+SWEEP_DML_BATCH_SIZE = 10000
+
+CRAWL_BUDGET = 200
+CRAWL_WORKERS = 4
+CRAWL_MAX_PAGES = 5
+CRAWL_PER_PAGE = 96
+
+RUN_SUMMARY_PATH = "cache/runs.jsonl"
+RUN_HISTORY_SIZE = 7
+RUN_HISTORY_SCAN = 50
+RUN_REGRESSION_THRESHOLD = 0.3
+RUN_REGRESSION_METRICS = ["request_rate", "n_unique", "n_inserted"]
+RUN_COMPARE_PARAMS = ["women", "only_vintage", "filter_by", "domains"]
+
+SINK_FORMAT = "parquet"
+SINK_COMPRESSION = "zstd"
+
+IMAGE_FETCH_WORKERS = 8
+IMAGE_FETCH_MAX_INFLIGHT_BYTES = 64 * 1024 * 1024
+IMAGE_FETCH_CHUNK_SIZE = 64 * 1024
+IMAGE_FETCH_TIMEOUT = 30
+IMAGE_FETCH_MAX_UNDECLARED_BYTES = 8 * 1024 * 1024
+IMAGE_BLOB_BATCH_SIZE = 500
+
+DEAD_LETTER_PATH = "cache/deadletter.sqlite"
+DEAD_LETTER_MAX_ATTEMPTS = 8
+DEAD_LETTER_BACKOFF = 60
+DEAD_LETTER_MAX_BACKOFF = 6 * 60 * 60
+
+CIRCUIT_POLL = 1
+CIRCUIT_MAX_WAIT = 15 * 60
+
+UPLOAD_MAX_ROWS = 5000
+UPLOAD_MAX_BYTES = 8 * 1024 * 1024
+UPLOAD_MAX_RETRIES = 4
+UPLOAD_RETRY_BACKOFF = 1
+UPLOAD_WORKERS = 8
+UPLOAD_MAX_IN_FLIGHT = 8
+UPLOAD_RETRYABLE_REASONS = [
+    "stopped",
+    "backendError",
+    "internalError",
+    "timeout",
+    "rateLimitExceeded",
+]
+UPLOAD_RETRYABLE_CODES = [408, 429, 500, 502, 503, 504]
+UPLOAD_TOO_LARGE_CODE = 413
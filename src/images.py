@@ -0,0 +1,210 @@
+from typing import List, Optional, Iterable, TYPE_CHECKING
+
+import os, uuid, hashlib, threading, datetime
+import requests
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor, Future
+
+from .rows import ImageRow, ImageBlobRow, to_json_rows
+from .state import VisitedSet
+from .bigquery import load_table, upload
+from .utils import create_batches
+from .vinted.enums import USER_AGENT
+from .enums import *
+
+if TYPE_CHECKING:
+    from google.cloud import bigquery
+
+
+class ByteBudget:
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.in_flight = 0
+        self._condition = threading.Condition()
+
+    def acquire(self, n_bytes: int) -> int:
+        n_bytes = min(n_bytes, self.max_bytes)
+
+        with self._condition:
+            while self.in_flight + n_bytes > self.max_bytes:
+                self._condition.wait()
+
+            self.in_flight += n_bytes
+
+        return n_bytes
+
+    def release(self, n_bytes: int):
+        with self._condition:
+            self.in_flight -= n_bytes
+            self._condition.notify_all()
+
+
+class ImageFetcher:
+    def __init__(
+        self,
+        bq_client: "bigquery.Client",
+        directory: str,
+        workers: int = IMAGE_FETCH_WORKERS,
+        max_inflight_bytes: int = IMAGE_FETCH_MAX_INFLIGHT_BYTES,
+        chunk_size: int = IMAGE_FETCH_CHUNK_SIZE,
+    ):
+        self.bq_client = bq_client
+        self.directory = directory
+        self.chunk_size = chunk_size
+
+        self.session = requests.Session()
+        self.session.headers.update({"User-Agent": USER_AGENT})
+        adapter = HTTPAdapter(pool_connections=workers, pool_maxsize=workers)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        self._budget = ByteBudget(max_inflight_bytes)
+        self._hashes = VisitedSet()
+        self._items = VisitedSet()
+        self._executor = ThreadPoolExecutor(max_workers=workers)
+        self._futures: List[Future] = []
+        self._lock = threading.Lock()
+
+        self.num_fetched = 0
+        self.num_duplicates = 0
+        self.num_bytes = 0
+        self.num_uploaded = 0
+
+        os.makedirs(self.directory, exist_ok=True)
+
+    def load(self) -> int:
+        rows = load_table(
+            client=self.bq_client,
+            table_id=IMAGE_BLOB_TABLE_ID,
+            dataset_id=DATASET_ID,
+            fields=["vinted_id"],
+            to_list=False,
+        )
+
+        for row in rows:
+            self._items.add(row["vinted_id"])
+
+        return len(self._items)
+
+    def submit(self, image_entries: Iterable[ImageRow]):
+        futures = [
+            self._executor.submit(self.fetch, image_entry)
+            for image_entry in image_entries
+            if self._items.add(image_entry.vinted_id)
+        ]
+
+        with self._lock:
+            self._futures.extend(futures)
+
+    def flush(self) -> int:
+        with self._lock:
+            futures, self._futures = self._futures, []
+
+        rows = [row for row in (future.result() for future in futures) if row]
+        num_uploaded = 0
+
+        for batch in create_batches(rows, IMAGE_BLOB_BATCH_SIZE):
+            result = upload(
+                client=self.bq_client,
+                dataset_id=DATASET_ID,
+                table_id=IMAGE_BLOB_TABLE_ID,
+                rows=to_json_rows(batch),
+            )
+            num_uploaded += result.n_success
+
+        self.num_uploaded += num_uploaded
+
+        return num_uploaded
+
+    def close(self) -> int:
+        num_uploaded = self.flush()
+        self._executor.shutdown(wait=True)
+        self.session.close()
+
+        return num_uploaded
+
+    def fetch(self, image_entry: ImageRow) -> Optional[ImageBlobRow]:
+        tmp_path = os.path.join(self.directory, f".{uuid.uuid4().hex}.part")
+
+        try:
+            with self.session.get(
+                image_entry.url, stream=True, timeout=IMAGE_FETCH_TIMEOUT
+            ) as response:
+                if response.status_code != 200:
+                    return
+
+                content_length = int(
+                    response.headers.get("Content-Length")
+                    or IMAGE_FETCH_MAX_UNDECLARED_BYTES
+                )
+                reserved = self._budget.acquire(content_length)
+
+                try:
+                    content_hash, n_bytes = self._write(response, tmp_path, reserved)
+                finally:
+                    self._budget.release(reserved)
+
+                content_type = response.headers.get("Content-Type")
+
+        except Exception as e:
+            print(e)
+            self._remove(tmp_path)
+            return
+
+        path = self._blob_path(content_hash, content_type)
+        is_duplicate = not self._hashes.add(content_hash) or os.path.exists(path)
+
+        if is_duplicate:
+            self._remove(tmp_path)
+        else:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            os.replace(tmp_path, path)
+
+        with self._lock:
+            self.num_fetched += 1
+            self.num_bytes += n_bytes
+            self.num_duplicates += int(is_duplicate)
+
+        return ImageBlobRow(
+            vinted_id=image_entry.vinted_id,
+            url=image_entry.url,
+            content_hash=content_hash,
+            n_bytes=n_bytes,
+            content_type=content_type,
+            path=os.path.relpath(path, self.directory),
+            is_duplicate=is_duplicate,
+            created_at=datetime.datetime.now().isoformat(),
+        )
+
+    def _write(self, response: requests.Response, path: str, max_bytes: int):
+        digest = hashlib.sha256()
+        n_bytes = 0
+
+        with open(path, "wb") as file:
+            for chunk in response.iter_content(chunk_size=self.chunk_size):
+                if n_bytes + len(chunk) > max_bytes:
+                    raise ValueError(f"Image larger than {max_bytes} bytes")
+
+                digest.update(chunk)
+                file.write(chunk)
+                n_bytes += len(chunk)
+
+        return digest.hexdigest(), n_bytes
+
+    def _blob_path(self, content_hash: str, content_type: Optional[str]) -> str:
+        extension = {
+            "image/jpeg": ".jpeg",
+            "image/png": ".png",
+            "image/webp": ".webp",
+        }.get((content_type or "").split(";")[0], "")
+
+        return os.path.join(
+            self.directory, content_hash[:2], f"{content_hash}{extension}"
+        )
+
+    @staticmethod
+    def _remove(path: str):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
@@ -1,8 +1,12 @@
-from typing import Dict, Tuple, Optional, List
+from typing import Dict, Tuple, Optional, Container, TYPE_CHECKING
 
-import uuid, datetime
-from .enums import VALID_FILTER_KEYS, MAX_BRAND_TITLE_LENGTH
+import uuid, datetime, json
+from .enums import VALID_FILTER_KEYS, MAX_BRAND_TITLE_LENGTH, ENRICHMENT_ATTRIBUTE_KEYS
 from .vinted.models import VintedResponse
+from .rows import ItemRow, ImageRow, LikesRow, ItemDetailsRow, ItemEnrichmentRow
+
+if TYPE_CHECKING:
+    from .canonical import CanonicalIndex
 
 
 def parse_filters(response: VintedResponse) -> Dict:
@@ -35,20 +39,24 @@ def parse_filters(response: VintedResponse) -> Dict:
 def parse_item(
     item: Dict,
     catalog_id: int,
-    visited: List[int],
+    visited: Container[str],
     material_id: Optional[int] = None,
     pattern_id: Optional[int] = None,
     color_id: Optional[int] = None,
-) -> Optional[Tuple[Dict, Dict, Dict, Dict]]:
+    domain: str = "fr",
+    canonical: Optional["CanonicalIndex"] = None,
+) -> Optional[Tuple[ItemRow, ImageRow, LikesRow, ItemDetailsRow]]:
     try:
-        result = _parse_item(item, catalog_id, material_id, pattern_id, color_id)
+        result = _parse_item(
+            item, catalog_id, material_id, pattern_id, color_id, domain, canonical
+        )
 
         if not result:
             return
 
         item_entry, image_entry, likes_entry, item_details_entry = result
 
-        if item_entry.get("vinted_id") in visited:
+        if item_entry.vinted_id in visited:
             return
 
         return item_entry, image_entry, likes_entry, item_details_entry
@@ -63,7 +71,9 @@ def _parse_item(
     material_id: Optional[int] = None,
     pattern_id: Optional[int] = None,
     color_id: Optional[int] = None,
-) -> Tuple[Dict, Dict, Dict, Dict] | None:
+    domain: str = "fr",
+    canonical: Optional["CanonicalIndex"] = None,
+) -> Tuple[ItemRow, ImageRow, LikesRow, ItemDetailsRow] | None:
     vinted_id = str(item.get("id"))
     if not vinted_id:
         return
@@ -80,53 +90,119 @@ def _parse_item(
     if len(brand_title) >= MAX_BRAND_TITLE_LENGTH:
         return
 
+    size_title = _parse_size(item)
+    brand_id, size_id = None, None
+
+    if canonical is not None:
+        brand_match = canonical.brand(brand_title)
+        if brand_match:
+            brand_id, brand_title = brand_match
+
+        size_match = canonical.size(size_title, catalog_id)
+        if size_match:
+            size_id = size_match[0]
+
     item_id = str(uuid.uuid4())
-    created_at = datetime.datetime.now().isoformat()
-    unix_created_at = int(datetime.datetime.now().timestamp())
-
-    item_entry = {
-        "id": item_id,
-        "vinted_id": vinted_id,
-        "catalog_id": catalog_id,
-        "title": item.get("title"),
-        "url": item_url,
-        "price": _parse_price(item),
-        "currency": _parse_currency(item),
-        "brand": brand_title,
-        "size": _parse_size(item),
-        "condition": item.get("status"),
-        "is_available": True,
-        "created_at": created_at,
-        "updated_at": created_at,
-        "unix_created_at": unix_created_at,
-    }
-
-    image_entry = {
-        "id": str(uuid.uuid4()),
-        "vinted_id": vinted_id,
-        "url": image_url,
-        "nobg": False,
-        "size": "original",
-        "created_at": created_at,
-    }
-
-    likes_entry = {
-        "vinted_id": vinted_id,
-        "count": _parse_likes(item),
-        "created_at": created_at,
-    }
-
-    item_details_entry = {
-        "item_id": item_id,
-        "material_id": material_id,
-        "pattern_id": pattern_id,
-        "color_id": color_id,
-        "created_at": created_at,
-    }
+    now = datetime.datetime.now()
+    created_at = now.isoformat()
+    unix_created_at = int(now.timestamp())
+
+    item_entry = ItemRow(
+        id=item_id,
+        vinted_id=vinted_id,
+        catalog_id=catalog_id,
+        domain=domain,
+        title=item.get("title"),
+        url=item_url,
+        price=_parse_price(item),
+        currency=_parse_currency(item),
+        brand=brand_title,
+        brand_id=brand_id,
+        size=size_title,
+        size_id=size_id,
+        condition=item.get("status"),
+        is_available=True,
+        created_at=created_at,
+        updated_at=created_at,
+        unix_created_at=unix_created_at,
+    )
+
+    image_entry = ImageRow(
+        id=str(uuid.uuid4()),
+        vinted_id=vinted_id,
+        url=image_url,
+        nobg=False,
+        size="original",
+        created_at=created_at,
+    )
+
+    likes_entry = LikesRow(
+        vinted_id=vinted_id,
+        count=_parse_likes(item),
+        created_at=created_at,
+    )
+
+    item_details_entry = ItemDetailsRow(
+        item_id=item_id,
+        material_id=material_id,
+        pattern_id=pattern_id,
+        color_id=color_id,
+        created_at=created_at,
+    )
 
     return (item_entry, image_entry, likes_entry, item_details_entry)
 
 
+def parse_item_info(
+    response: VintedResponse, vinted_id: str
+) -> Optional[ItemEnrichmentRow]:
+    if response.status_code != 200 or not isinstance(response.data, dict):
+        return
+
+    item = response.data.get("item")
+    if not item:
+        return
+
+    try:
+        attributes = {
+            key: item.get(key) for key in ENRICHMENT_ATTRIBUTE_KEYS if key in item
+        }
+
+        return ItemEnrichmentRow(
+            vinted_id=vinted_id,
+            seller_id=_parse_seller_id(item),
+            description=item.get("description"),
+            attributes=json.dumps(attributes, ensure_ascii=False),
+            uploaded_at=_parse_timestamp(item.get("created_at_ts")),
+            created_at=datetime.datetime.now().isoformat(),
+        )
+
+    except:
+        return
+
+
+def _parse_seller_id(item: Dict) -> int | None:
+    try:
+        return int(item.get("user_id") or item.get("user", {}).get("id"))
+    except:
+        return
+
+
+def _parse_timestamp(value) -> str | None:
+    if value is None:
+        return
+
+    try:
+        return datetime.datetime.fromtimestamp(int(value)).isoformat()
+    except (TypeError, ValueError):
+        pass
+
+    try:
+        return datetime.datetime.fromisoformat(value).isoformat()
+    except:
+        return
+
+
 def _parse_size(item: Dict) -> str:
     size = item.get("size_title")
     if not size:
@@ -0,0 +1,136 @@
+from typing import List, Dict, Optional, Sequence, Union
+from dataclasses import dataclass
+from operator import attrgetter
+
+
+@dataclass(slots=True)
+class ItemRow:
+    id: str
+    vinted_id: str
+    catalog_id: int
+    domain: str
+    title: Optional[str]
+    url: str
+    price: Optional[float]
+    currency: Optional[str]
+    brand: Optional[str]
+    brand_id: Optional[int]
+    size: Optional[str]
+    size_id: Optional[int]
+    condition: Optional[str]
+    is_available: bool
+    created_at: str
+    updated_at: str
+    unix_created_at: int
+    price_outlier: Optional[bool] = None
+    fx_price: Optional[float] = None
+    fx_currency: Optional[str] = None
+
+
+@dataclass(slots=True)
+class ImageRow:
+    id: str
+    vinted_id: str
+    url: str
+    nobg: bool
+    size: str
+    created_at: str
+
+
+@dataclass(slots=True)
+class LikesRow:
+    vinted_id: str
+    count: int
+    created_at: str
+
+
+@dataclass(slots=True)
+class ItemDetailsRow:
+    item_id: str
+    material_id: Optional[int]
+    pattern_id: Optional[int]
+    color_id: Optional[int]
+    created_at: str
+
+
+@dataclass(slots=True)
+class ItemEnrichmentRow:
+    vinted_id: str
+    seller_id: Optional[int]
+    description: Optional[str]
+    attributes: Optional[str]
+    uploaded_at: Optional[str]
+    created_at: str
+    status: str = "ok"
+
+
+@dataclass(slots=True)
+class PriceHistoryRow:
+    vinted_id: str
+    price: Optional[float]
+    favourite_count: Optional[int]
+    is_available: bool
+    previous_price: Optional[float]
+    previous_favourite_count: Optional[int]
+    previous_is_available: Optional[bool]
+    created_at: str
+
+
+@dataclass(slots=True)
+class ImageBlobRow:
+    vinted_id: str
+    url: str
+    content_hash: str
+    n_bytes: int
+    content_type: Optional[str]
+    path: str
+    is_duplicate: bool
+    created_at: str
+
+
+@dataclass(slots=True)
+class RunRow:
+    run_id: str
+    started_at: str
+    finished_at: str
+    duration: float
+    params: str
+    stages: str
+    requests: str
+    catalogs: str
+    n_requests: int
+    n_parsed: int
+    n_unique: int
+    n_uploaded: int
+    n_inserted: int
+    upload_bytes: int
+    backoff_time: float
+    request_rate: float
+
+
+Row = Union[
+    ItemRow,
+    ImageRow,
+    LikesRow,
+    ItemDetailsRow,
+    ItemEnrichmentRow,
+    PriceHistoryRow,
+    ImageBlobRow,
+    RunRow,
+]
+
+
+_getters = {}
+
+
+def to_json_rows(rows: Sequence[Row]) -> List[Dict]:
+    if not rows:
+        return []
+
+    fields = rows[0].__slots__
+    getter = _getters.get(fields)
+
+    if getter is None:
+        getter = _getters[fields] = attrgetter(*fields)
+
+    return [dict(zip(fields, getter(row))) for row in rows]
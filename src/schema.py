@@ -0,0 +1,135 @@
+from typing import List, Tuple, TYPE_CHECKING
+
+from .enums import *
+
+if TYPE_CHECKING:
+    from google.cloud import bigquery
+
+
+Columns = List[Tuple[str, str]]
+
+
+ITEM_COLUMNS = [
+    ("domain", "STRING"),
+    ("brand_id", "INT64"),
+    ("size_id", "INT64"),
+    ("price_outlier", "BOOL"),
+    ("checked_at", "TIMESTAMP"),
+    ("fx_price", "FLOAT64"),
+    ("fx_currency", "STRING"),
+]
+
+ADDED_COLUMNS = {
+    CATALOG_TABLE_ID: [
+        ("parent_id", "INT64"),
+        ("depth", "INT64"),
+        ("hash", "STRING"),
+    ],
+    ITEM_TABLE_ID: ITEM_COLUMNS,
+    STAGING_ITEM_TABLE_ID: ITEM_COLUMNS,
+}
+
+NEW_TABLES = {
+    PRICE_HISTORY_TABLE_ID: [
+        ("vinted_id", "STRING NOT NULL"),
+        ("price", "FLOAT64"),
+        ("favourite_count", "INT64"),
+        ("is_available", "BOOL"),
+        ("previous_price", "FLOAT64"),
+        ("previous_favourite_count", "INT64"),
+        ("previous_is_available", "BOOL"),
+        ("created_at", "TIMESTAMP"),
+    ],
+    ITEM_ENRICHMENT_TABLE_ID: [
+        ("vinted_id", "STRING NOT NULL"),
+        ("seller_id", "INT64"),
+        ("description", "STRING"),
+        ("attributes", "STRING"),
+        ("uploaded_at", "TIMESTAMP"),
+        ("created_at", "TIMESTAMP"),
+        ("status", "STRING"),
+    ],
+    IMAGE_BLOB_TABLE_ID: [
+        ("vinted_id", "STRING NOT NULL"),
+        ("url", "STRING NOT NULL"),
+        ("content_hash", "STRING"),
+        ("n_bytes", "INT64"),
+        ("content_type", "STRING"),
+        ("path", "STRING"),
+        ("is_duplicate", "BOOL"),
+        ("created_at", "TIMESTAMP"),
+    ],
+    REJECT_TABLE_ID: [
+        ("table_id", "STRING"),
+        ("row", "STRING"),
+        ("reason", "STRING"),
+        ("created_at", "TIMESTAMP"),
+    ],
+    RUNS_TABLE_ID: [
+        ("run_id", "STRING NOT NULL"),
+        ("started_at", "TIMESTAMP"),
+        ("finished_at", "TIMESTAMP"),
+        ("duration", "FLOAT64"),
+        ("params", "STRING"),
+        ("stages", "STRING"),
+        ("requests", "STRING"),
+        ("catalogs", "STRING"),
+        ("n_requests", "INT64"),
+        ("n_parsed", "INT64"),
+        ("n_unique", "INT64"),
+        ("n_uploaded", "INT64"),
+        ("n_inserted", "INT64"),
+        ("upload_bytes", "INT64"),
+        ("backoff_time", "FLOAT64"),
+        ("request_rate", "FLOAT64"),
+    ],
+}
+
+
+def _table(table_id: str, dataset_id: str) -> str:
+    return f"`{PROJECT_ID}.{dataset_id}.{table_id}`"
+
+
+def add_columns_ddl(
+    table_id: str, columns: Columns, dataset_id: str = DATASET_ID
+) -> str:
+    additions = ",\n".join(
+        f"    ADD COLUMN IF NOT EXISTS {name} {type_}" for name, type_ in columns
+    )
+
+    return f"ALTER TABLE IF EXISTS {_table(table_id, dataset_id)}\n{additions};"
+
+
+def create_table_ddl(
+    table_id: str, columns: Columns, dataset_id: str = DATASET_ID
+) -> str:
+    fields = ",\n".join(f"    {name} {type_}" for name, type_ in columns)
+
+    return f"CREATE TABLE IF NOT EXISTS {_table(table_id, dataset_id)} (\n{fields}\n);"
+
+
+def migrations(dataset_id: str = DATASET_ID) -> List[str]:
+    statements = [
+        add_columns_ddl(table_id, columns, dataset_id)
+        for table_id, columns in ADDED_COLUMNS.items()
+    ]
+    statements.extend(
+        create_table_ddl(table_id, columns, dataset_id)
+        for table_id, columns in NEW_TABLES.items()
+    )
+
+    return statements
+
+
+def migrate(client: "bigquery.Client", dataset_id: str = DATASET_ID) -> int:
+    applied = 0
+
+    for statement in migrations(dataset_id):
+        try:
+            client.query(statement).result()
+            applied += 1
+        except Exception as e:
+            print(e)
+            return -1
+
+    return applied
@@ -1,24 +1,83 @@
-from typing import List, Dict, Tuple, Optional, Iterable
-
-import random
-from tqdm import tqdm
-from google.cloud import bigquery
-
-from .vinted import Vinted, VintedResponse
+from typing import (
+    List,
+    Dict,
+    Tuple,
+    Optional,
+    Iterable,
+    Container,
+    Callable,
+    TYPE_CHECKING,
+)
+
+import random, time, threading
+from concurrent.futures import ThreadPoolExecutor
+
+from .vinted import Vinted, VintedResponse, SearchKey
+from .vinted.enums import CIRCUIT_OPEN
+from .vinted.endpoints import Endpoints
+from .state import VisitedSet, ScraperState
+from .changes import ChangeTracker
+from .images import ImageFetcher
+from .deadletter import DeadLetterQueue, SEARCH, ROWS
+from .canonical import CanonicalIndex
+from .crawler import SellerFrontier
+from .sink import ColumnarSink
+from .tuner import PageSizeTuner
+from .writer import UploadExecutor
 from .parse import parse_filters, parse_item
-from .utils import random_sleep, prepare_search_kwargs
+from .rows import (
+    ItemRow,
+    ImageRow,
+    LikesRow,
+    ItemDetailsRow,
+    PriceHistoryRow,
+    to_json_rows,
+)
+from .utils import random_sleep, prepare_search_keys
 from .bigquery import insert_staging_rows, reset_staging_table, upload
 from .enums import *
 
+if TYPE_CHECKING:
+    from google.cloud import bigquery
+
 
 class VintedScraper:
     def __init__(
         self,
-        bq_client: bigquery.Client,
+        bq_client: "bigquery.Client",
         vinted_client: Vinted,
+        visited: Optional[VisitedSet] = None,
+        tracker: Optional[ChangeTracker] = None,
+        image_fetcher: Optional[ImageFetcher] = None,
+        dead_letters: Optional[DeadLetterQueue] = None,
+        postprocess: bool = False,
+        fx_rates: Optional[Dict[str, float]] = None,
+        canonical: Optional[CanonicalIndex] = None,
+        frontier: Optional[SellerFrontier] = None,
+        sink: Optional[ColumnarSink] = None,
+        tuner: Optional[PageSizeTuner] = None,
+        stream: bool = False,
+        rng: Optional[random.Random] = None,
+        uploader: Optional[UploadExecutor] = None,
     ):
         self.bq_client = bq_client
         self.vinted_client = vinted_client
+        self.domain = vinted_client.domain
+        self.tracker = tracker
+        self.image_fetcher = image_fetcher
+        self.dead_letters = dead_letters
+        self.postprocess = postprocess
+        self.fx_rates = fx_rates
+        self.canonical = canonical if canonical is not None else CanonicalIndex()
+        self.frontier = frontier
+        self.sink = sink
+        self.tuner = tuner
+        self.stream = stream
+        self.rng = rng or random.Random()
+        self._uploader = uploader
+        self._owns_uploader = uploader is None
+        self._uploader_lock = threading.Lock()
+        self._shared_visited = visited
 
         self._reference_field = "vinted_id"
         self._filter_batch_size = 1
@@ -26,57 +85,98 @@ class VintedScraper:
         self.reset()
 
     def reset(self):
-        self.n = 0
-        self.n_success = 0
-        self.current_catalog = 0
+        self.state = ScraperState(self._shared_visited)
+        self.visited = self.state.visited
         self.counter = 0
-        self.visited = []
-        self.num_uploaded = 0
         self.num_inserted = 0
 
+    @property
+    def uploader(self) -> UploadExecutor:
+        with self._uploader_lock:
+            if self._uploader is None:
+                self._uploader = UploadExecutor(self.bq_client)
+
+            return self._uploader
+
+    def close(self):
+        if not self._owns_uploader:
+            return
+
+        with self._uploader_lock:
+            uploader, self._uploader = self._uploader, None
+
+        if uploader is not None:
+            uploader.shutdown(wait=True)
+
+    @property
+    def n(self) -> int:
+        return self.state.n.value
+
+    @property
+    def n_success(self) -> int:
+        return self.state.n_success.value
+
+    @property
+    def current_catalog(self) -> int:
+        return self.state.current_catalog.value
+
+    @property
+    def num_uploaded(self) -> int:
+        return self.state.num_uploaded.value
+
     def run(
         self,
         catalogs: List[Dict],
         filter_by: str,
         only_vintage: bool,
         women: bool,
+        position: int = 0,
+        workers: int = 1,
     ):
-        loop = tqdm(iterable=catalogs, total=len(catalogs))
+        from tqdm import tqdm
+
+        loop = tqdm(iterable=catalogs, total=len(catalogs), position=position)
+        executor = ThreadPoolExecutor(max_workers=workers) if workers > 1 else None
+        upload_executor = ThreadPoolExecutor(max_workers=1)
+        pending_upload = None
 
         for entry in loop:
-            self.current_catalog = 0
+            self.state.current_catalog.reset()
             self.counter += 1
 
             catalog_title = entry.get("title")
             catalog_id = entry.get("id")
 
-            filters_response = self.vinted_client.catalog_filters(
-                catalog_ids=[catalog_id]
+            filters_response = self._call(
+                Endpoints.CATALOG_FILTERS,
+                lambda: self.vinted_client.catalog_filters(catalog_ids=[catalog_id]),
             )
             filters = parse_filters(filters_response)
+            self.canonical.update(filters, catalog_id)
 
-            search_kwargs_list = self._process_catalog_filters(
+            search_keys = self._process_catalog_filters(
                 catalog_id, filters, filter_by, only_vintage
             )
 
-            item_entries, image_entries, likes_entries, item_details_entries = (
-                [],
-                [],
-                [],
-                [],
-            )
-
-            for search_kwargs in search_kwargs_list:
-                material_id = search_kwargs.get("material_ids", [None])[0]
-                pattern_id = search_kwargs.get("patterns_ids", [None])[0]
-                color_id = search_kwargs.get("color_ids", [None])[0]
-
-                response = self.vinted_client.search(**search_kwargs)
-
-                results = self._process_search_response(
-                    response, catalog_id, material_id, pattern_id, color_id
+            (
+                item_entries,
+                image_entries,
+                likes_entries,
+                item_details_entries,
+                price_history_entries,
+            ) = ([], [], [], [], [])
+
+            if executor is not None:
+                searches = executor.map(
+                    lambda search_key: self._search(search_key, catalog_id),
+                    search_keys,
+                )
+            else:
+                searches = (
+                    self._search(search_key, catalog_id) for search_key in search_keys
                 )
 
+            for search_key, results in searches:
                 if not results:
                     continue
 
@@ -85,24 +185,201 @@ class VintedScraper:
                     new_image_entries,
                     new_likes_entries,
                     new_item_details_entries,
+                    new_price_history_entries,
                 ) = results
 
                 item_entries.extend(new_item_entries)
                 image_entries.extend(new_image_entries)
                 likes_entries.extend(new_likes_entries)
                 item_details_entries.extend(new_item_details_entries)
+                price_history_entries.extend(new_price_history_entries)
 
                 self._update_progress(
                     loop,
                     women,
                     catalog_title,
-                    color_id,
+                    self._get_filter_ids(search_key)[2],
                 )
 
-            self.num_uploaded += self._upload(
-                item_entries, image_entries, likes_entries, item_details_entries
+            self.rng.shuffle(item_entries)
+
+            if pending_upload is not None:
+                pending_upload.result()
+
+            pending_upload = upload_executor.submit(
+                self._upload_catalog,
+                catalog_id,
+                self.current_catalog,
+                item_entries,
+                image_entries,
+                likes_entries,
+                item_details_entries,
+                price_history_entries,
+            )
+
+        if pending_upload is not None:
+            pending_upload.result()
+
+        upload_executor.shutdown(wait=True)
+
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+        self.close()
+
+    def _upload_catalog(
+        self,
+        catalog_id: int,
+        num_parsed: int,
+        item_entries: List[ItemRow],
+        *entries: List,
+    ):
+        num_uploaded = self._upload(item_entries, *entries, catalog_id=catalog_id)
+
+        self.state.num_uploaded.add(num_uploaded)
+        self.state.record_catalog(
+            catalog_id,
+            parsed=num_parsed,
+            unique=len(item_entries),
+            uploaded=num_uploaded,
+        )
+
+    def _search(
+        self, search_key: SearchKey, catalog_id: int
+    ) -> Tuple[SearchKey, Optional[Tuple]]:
+        start_time = time.monotonic()
+        response = self._call(
+            Endpoints.CATALOG_ITEMS,
+            lambda: self.vinted_client.search_key(search_key, stream=self.stream),
+        )
+
+        results = self._process_search_response(
+            response, catalog_id, *self._get_filter_ids(search_key)
+        )
+
+        failed = response.status_code != 200 or response.error is not None
+
+        if failed and self.dead_letters is not None:
+            self.dead_letters.push_search(
+                domain=self.domain,
+                payload={
+                    "catalog_id": catalog_id,
+                    "search_kwargs": search_key.to_kwargs(),
+                },
+                reason=response.error or f"status {response.status_code}",
+            )
+
+        if self.tuner is not None and not failed:
+            self.tuner.record(
+                catalog_id,
+                search_key.per_page,
+                elapsed=time.monotonic() - start_time,
+                n_bytes=response.n_bytes,
+                n_new=len(results[0]) if results else 0,
+            )
+
+        return search_key, results
+
+    def _call(
+        self, endpoint: Endpoints, request: Callable[[], VintedResponse]
+    ) -> VintedResponse:
+        response, waited = request(), 0.0
+
+        while response.status_code == CIRCUIT_OPEN and waited < CIRCUIT_MAX_WAIT:
+            breaker = self.vinted_client.breaker(endpoint)
+            delay = max(breaker.retry_after(), CIRCUIT_POLL)
+            time.sleep(delay)
+
+            waited += delay
+            self.state.backoff_time.add(delay)
+            response = request()
+
+        return response
+
+    def retry_searches(self, limit: Optional[int] = None, force: bool = False) -> int:
+        if self.dead_letters is None:
+            return 0
+
+        recovered = 0
+
+        for entry in self.dead_letters.due(SEARCH, self.domain, limit, force):
+            catalog_id = entry.payload.get("catalog_id")
+            search_key = SearchKey.from_kwargs(entry.payload.get("search_kwargs", {}))
+
+            response = self._call(
+                Endpoints.CATALOG_ITEMS,
+                lambda: self.vinted_client.search_key(search_key),
             )
 
+            if response.status_code == CIRCUIT_OPEN:
+                break
+
+            if response.status_code != 200:
+                self.dead_letters.nack(entry, f"status {response.status_code}")
+                continue
+
+            results = self._process_search_response(
+                response, catalog_id, *self._get_filter_ids(search_key)
+            )
+            self.rng.shuffle(results[0])
+            self.state.num_uploaded.add(self._upload(*results, catalog_id=catalog_id))
+
+            self.dead_letters.ack(entry)
+            recovered += 1
+
+        return recovered
+
+    def retry_rows(self, limit: Optional[int] = None, force: bool = False) -> int:
+        if self.dead_letters is None:
+            return 0
+
+        recovered = 0
+
+        for entry in self.dead_letters.due(ROWS, limit=limit, force=force):
+            table_id = entry.payload.get("table_id")
+            rows = entry.payload.get("rows", [])
+
+            result = upload(
+                client=self.bq_client,
+                dataset_id=DATASET_ID,
+                table_id=table_id,
+                rows=rows,
+            )
+
+            if not result and result.n_success == 0:
+                self.dead_letters.nack(entry, "upload failed")
+                continue
+
+            if table_id == STAGING_ITEM_TABLE_ID:
+                self.state.num_uploaded.add(result.n_success)
+
+            self.dead_letters.ack(entry)
+            self._dead_letter_rows(table_id, result.failed)
+            recovered += result.n_success
+
+        return recovered
+
+    def ingest(
+        self, response: VintedResponse, catalog_ids: Optional[Container[int]] = None
+    ) -> int:
+        if catalog_ids is not None and isinstance(response.data, dict):
+            items = [
+                item
+                for item in response.data.get("items", [])
+                if item.get("catalog_id") in catalog_ids
+            ]
+            response = VintedResponse(response.status_code, {"items": items})
+
+        results = self._process_search_response(response, catalog_id=None)
+        if not results:
+            return 0
+
+        self.rng.shuffle(results[0])
+        num_uploaded = self._upload(*results)
+        self.state.num_uploaded.add(num_uploaded)
+
+        return num_uploaded
+
     def insert_from_staging(self):
         for table_id in [ITEM_TABLE_ID, IMAGE_TABLE_ID]:
             inserted = insert_staging_rows(
@@ -110,6 +387,7 @@ class VintedScraper:
                 dataset_id=DATASET_ID,
                 table_id=table_id,
                 reference_field=self._reference_field,
+                seed=self.rng.getrandbits(32),
             )
 
             self.num_inserted += max(inserted, 0)
@@ -134,35 +412,43 @@ class VintedScraper:
         catalog_title: str,
         color_id: Optional[int] = None,
     ):
-        success_rate = self.n_success / self.n if self.n > 0 else 0
+        state = self.state.snapshot()
+        success_rate = state["n_success"] / state["n"] if state["n"] > 0 else 0
 
         loop.set_description(
+            f"Domain: {self.domain} | "
             f"Women: {women} | "
             f"Catalog: {catalog_title} | "
             f"Color: {color_id} | "
-            f"Items: {self.current_catalog} | "
-            f"Processed: {self.n} | "
-            f"Success: {self.n_success} | "
+            f"Items: {state['current_catalog']} | "
+            f"Processed: {state['n']} | "
+            f"Success: {state['n_success']} | "
             f"Success rate: {success_rate:.2f} | "
-            f"Uploaded: {self.num_uploaded} | "
+            f"Uploaded: {state['num_uploaded']} | "
         )
 
     def _upload(
         self,
-        item_entries: List[Dict],
-        image_entries: List[Dict],
-        likes_entries: List[Dict],
-        item_details_entries: List[Dict],
+        item_entries: List[ItemRow],
+        image_entries: List[ImageRow],
+        likes_entries: List[LikesRow],
+        item_details_entries: List[ItemDetailsRow],
+        price_history_entries: List[PriceHistoryRow],
+        catalog_id: Optional[int] = None,
     ) -> int:
         num_uploaded = 0
 
-        random.shuffle(item_entries)
+        if self.postprocess:
+            from .vinted.postprocessing import transform_item_rows
+
+            transform_item_rows(item_entries, rates=self.fx_rates)
 
         all_rows = [
             item_entries,
             image_entries,
             likes_entries,
             item_details_entries,
+            price_history_entries,
         ]
 
         all_table_ids = [
@@ -170,82 +456,137 @@ class VintedScraper:
             STAGING_IMAGE_TABLE_ID,
             LIKES_TABLE_ID,
             ITEM_DETAILS_TABLE_ID,
+            PRICE_HISTORY_TABLE_ID,
         ]
 
-        for table_id, rows in zip(all_table_ids, all_rows):
-            if len(rows) > 0:
-                success = upload(
-                    client=self.bq_client,
-                    dataset_id=DATASET_ID,
-                    table_id=table_id,
-                    rows=rows,
-                )
+        if self.sink is not None:
+            for table_id, rows in zip(all_table_ids, all_rows):
+                self.sink.write(table_id, rows, catalog_id)
+
+        results = self.uploader.upload_many(
+            {
+                table_id: to_json_rows(rows)
+                for table_id, rows in zip(all_table_ids, all_rows)
+            }
+        )
+
+        for table_id, result in results.items():
+            self.state.upload_bytes.add(result.n_bytes)
+            self.state.backoff_time.add(result.backoff_time)
+            self._dead_letter_rows(table_id, result.failed)
 
-                if (
-                    table_id in [STAGING_ITEM_TABLE_ID, STAGING_IMAGE_TABLE_ID]
-                    and not success
-                ):
-                    return 0
+            if table_id == STAGING_ITEM_TABLE_ID:
+                num_uploaded += result.n_success
 
-                if table_id == STAGING_ITEM_TABLE_ID:
-                    num_uploaded += len(rows)
+        if self.image_fetcher is not None:
+            self.image_fetcher.submit(image_entries)
 
         return num_uploaded
 
+    def _dead_letter_rows(self, table_id: str, rows: List[Dict]):
+        if rows and self.dead_letters is not None:
+            self.dead_letters.push_rows(table_id, rows, reason="upload failed")
+
+    @staticmethod
+    def _get_filter_ids(
+        search_key: SearchKey,
+    ) -> Tuple[Optional[int], Optional[int], Optional[int]]:
+        filter_id = search_key.filter_ids[0] if search_key.filter_ids else None
+        filter_ids = {search_key.filter_key: filter_id}
+
+        return (
+            filter_ids.get("material"),
+            filter_ids.get("patterns"),
+            filter_ids.get("color"),
+        )
+
     def _process_catalog_filters(
         self,
         catalog_id: int,
         filters: Dict,
         filter_by: Optional[str] = None,
         only_vintage: bool = False,
-    ) -> List[Dict]:
+    ) -> List[SearchKey]:
         filter_by_updated = [filter_by]
 
         if catalog_id in DESIGNER_CATALOG_IDS:
             filter_by_updated.append("brand")
 
-        search_kwargs_list = []
+        search_keys = []
+        per_page = (
+            self.tuner.choose(catalog_id, self.rng)
+            if self.tuner is not None
+            else N_ITEMS_MAX
+        )
 
         for filter_key in filter_by_updated:
-            search_kwargs = prepare_search_kwargs(
-                catalog_id=catalog_id,
-                filter_key=filter_key,
-                filters=filters,
-                batch_size=self._filter_batch_size,
-                only_vintage=only_vintage,
+            search_keys.extend(
+                prepare_search_keys(
+                    catalog_id=catalog_id,
+                    filter_key=filter_key,
+                    filters=filters,
+                    batch_size=self._filter_batch_size,
+                    only_vintage=only_vintage,
+                    per_page=per_page,
+                    rng=self.rng,
+                )
             )
-            search_kwargs_list.extend(search_kwargs)
 
-        return search_kwargs_list
+        return search_keys
 
     def _process_search_response(
         self,
         response: VintedResponse,
-        catalog_id: int,
+        catalog_id: Optional[int],
         material_id: Optional[int] = None,
         pattern_id: Optional[int] = None,
         color_id: Optional[int] = None,
-    ) -> Tuple[List[Dict], List[Dict], List[Dict], List[Dict]] | None:
-        item_entries, image_entries, likes_entries, item_details_entries = (
-            [],
-            [],
-            [],
-            [],
-        )
+    ) -> (
+        Tuple[
+            List[ItemRow],
+            List[ImageRow],
+            List[LikesRow],
+            List[ItemDetailsRow],
+            List[PriceHistoryRow],
+        ]
+        | None
+    ):
+        (
+            item_entries,
+            image_entries,
+            likes_entries,
+            item_details_entries,
+            price_history_entries,
+        ) = ([], [], [], [], [])
 
         if response.status_code == 403:
-            random_sleep()
+            self.state.backoff_time.add(random_sleep())
             return
 
         elif response.status_code == 200 and isinstance(response.data, dict):
-            items = response.data.get("items", [])
+            n_items = 0
+
+            for item in response.data.get("items", []):
+                n_items += 1
+
+                if self.tracker is not None:
+                    price_history_entry = self.tracker.observe(item)
 
-            for item in items:
-                self.n += 1
-                self.current_catalog += 1
+                    if price_history_entry:
+                        price_history_entries.append(price_history_entry)
+
+                if self.frontier is not None:
+                    self.frontier.observe(item)
 
                 result = parse_item(
-                    item, catalog_id, self.visited, material_id, pattern_id, color_id
+                    item,
+                    catalog_id if catalog_id is not None else item.get("catalog_id"),
+                    self.visited,
+                    material_id,
+                    pattern_id,
+                    color_id,
+                    self.domain,
+                    self.canonical,
                 )
 
                 if not result:
@@ -253,12 +594,22 @@ class VintedScraper:
 
                 item_entry, image_entry, likes_entry, item_details_entry = result
 
+                if not self.visited.add(item_entry.vinted_id):
+                    continue
+
                 item_entries.append(item_entry)
                 image_entries.append(image_entry)
                 likes_entries.append(likes_entry)
                 item_details_entries.append(item_details_entry)
 
-                self.visited.append(item_entry.get("vinted_id"))
-                self.n_success += 1
+            self.state.n.add(n_items)
+            self.state.current_catalog.add(n_items)
+            self.state.n_success.add(len(item_entries))
 
-        return item_entries, image_entries, likes_entries, item_details_entries
+        return (
+            item_entries,
+            image_entries,
+            likes_entries,
+            item_details_entries,
+            price_history_entries,
+        )
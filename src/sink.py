@@ -0,0 +1,146 @@
+from typing import List, Optional, Sequence, TYPE_CHECKING
+
+import os, glob, uuid, datetime, threading
+
+from .rows import Row, to_json_rows
+from .enums import SINK_FORMAT, SINK_COMPRESSION
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+
+EXTENSIONS = {"parquet": ".parquet", "arrow": ".arrow"}
+
+
+class ColumnarSink:
+    def __init__(
+        self,
+        directory: str,
+        format: str = SINK_FORMAT,
+        compression: Optional[str] = SINK_COMPRESSION,
+        run_date: Optional[str] = None,
+    ):
+        if format not in EXTENSIONS:
+            raise ValueError(f"Unknown sink format: {format}")
+
+        try:
+            import pyarrow
+        except ImportError as e:
+            raise ImportError(
+                "ColumnarSink needs pyarrow: pip install -r requirements-extras.txt"
+            ) from e
+
+        self.directory = directory
+        self.format = format
+        self.compression = compression
+        self.run_date = run_date or datetime.date.today().isoformat()
+
+        self.num_files = 0
+        self.num_rows = 0
+        self.num_bytes = 0
+        self._lock = threading.Lock()
+
+    def write(
+        self, table_id: str, rows: Sequence[Row], catalog_id: Optional[int] = None
+    ) -> Optional[str]:
+        if not rows:
+            return
+
+        import pyarrow as pa
+
+        directory = self._partition(table_id, self.run_date, catalog_id)
+        os.makedirs(directory, exist_ok=True)
+
+        path = os.path.join(
+            directory, f"part-{uuid.uuid4().hex}{EXTENSIONS[self.format]}"
+        )
+        tmp_path = os.path.join(directory, f".{os.path.basename(path)}.tmp")
+
+        try:
+            table = pa.Table.from_pylist(to_json_rows(rows))
+            self._write_table(table, tmp_path)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            print(e)
+            return
+
+        n_bytes = os.path.getsize(path)
+
+        with self._lock:
+            self.num_files += 1
+            self.num_rows += table.num_rows
+            self.num_bytes += n_bytes
+
+        return path
+
+    def read(
+        self,
+        table_id: str,
+        run_date: Optional[str] = None,
+        catalog_id: Optional[int] = None,
+    ) -> Optional["pa.Table"]:
+        paths = self.paths(table_id, run_date, catalog_id)
+        if not paths:
+            return
+
+        return read_files(paths)
+
+    def paths(
+        self,
+        table_id: str,
+        run_date: Optional[str] = None,
+        catalog_id: Optional[int] = None,
+    ) -> List[str]:
+        pattern = os.path.join(
+            self._partition(table_id, run_date or "*", catalog_id or "*"),
+            f"part-*{EXTENSIONS[self.format]}",
+        )
+
+        return sorted(glob.glob(pattern))
+
+    def _partition(self, table_id: str, run_date: str, catalog_id) -> str:
+        return os.path.join(
+            self.directory,
+            table_id,
+            f"run_date={run_date}",
+            f"catalog_id={catalog_id if catalog_id is not None else 'none'}",
+        )
+
+    def _write_table(self, table: "pa.Table", path: str):
+        if self.format == "parquet":
+            import pyarrow.parquet as pq
+
+            pq.write_table(table, path, compression=self.compression or "none")
+
+        else:
+            import pyarrow as pa
+
+            options = pa.ipc.IpcWriteOptions(compression=self.compression)
+
+            with pa.OSFile(path, "wb") as file:
+                with pa.ipc.new_file(file, table.schema, options=options) as writer:
+                    writer.write_table(table)
+
+
+def read_files(paths: Sequence[str]) -> "pa.Table":
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    tables = []
+
+    for path in paths:
+        if path.endswith(EXTENSIONS["parquet"]):
+            tables.append(pq.ParquetFile(path, memory_map=True).read())
+        else:
+            source = pa.memory_map(path, "r")
+            tables.append(pa.ipc.open_file(source).read_all())
+
+    return pa.concat_tables(tables, promote_options="default")
+
+
+def write_parquet(table: "pa.Table", path: str) -> str:
+    import pyarrow.parquet as pq
+
+    pq.write_table(table, path, compression=SINK_COMPRESSION or "none")
+
+    return path
@@ -0,0 +1,101 @@
+from typing import Dict, Hashable, Iterable, Optional
+
+import threading, itertools
+
+from .enums import STATE_SHARDS
+
+
+class VisitedSet:
+    def __init__(
+        self, keys: Optional[Iterable[Hashable]] = None, stripes: int = STATE_SHARDS
+    ) -> None:
+        self._stripes = [set() for _ in range(stripes)]
+        self._locks = [threading.Lock() for _ in range(stripes)]
+
+        for key in keys or []:
+            self._stripe(key).add(key)
+
+    def add(self, key: Hashable) -> bool:
+        index = hash(key) % len(self._stripes)
+        keys = self._stripes[index]
+
+        with self._locks[index]:
+            if key in keys:
+                return False
+
+            keys.add(key)
+            return True
+
+    def _stripe(self, key: Hashable) -> set:
+        return self._stripes[hash(key) % len(self._stripes)]
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._stripe(key)
+
+    def __len__(self) -> int:
+        return sum(len(keys) for keys in self._stripes)
+
+
+_thread_ids = itertools.count()
+_thread_local = threading.local()
+
+
+def _thread_index() -> int:
+    try:
+        return _thread_local.index
+    except AttributeError:
+        _thread_local.index = next(_thread_ids)
+        return _thread_local.index
+
+
+class ShardedCounter:
+    def __init__(self, shards: int = STATE_SHARDS) -> None:
+        self._counts = [0] * shards
+        self._locks = [threading.Lock() for _ in range(shards)]
+
+    def add(self, n: float = 1) -> None:
+        index = _thread_index() % len(self._counts)
+
+        with self._locks[index]:
+            self._counts[index] += n
+
+    def reset(self) -> None:
+        for index, lock in enumerate(self._locks):
+            with lock:
+                self._counts[index] = 0
+
+    @property
+    def value(self) -> float:
+        return sum(self._counts)
+
+
+class ScraperState:
+    def __init__(self, visited: Optional[VisitedSet] = None) -> None:
+        self.visited = visited if visited is not None else VisitedSet()
+
+        self.n = ShardedCounter()
+        self.n_success = ShardedCounter()
+        self.current_catalog = ShardedCounter()
+        self.num_uploaded = ShardedCounter()
+        self.upload_bytes = ShardedCounter()
+        self.backoff_time = ShardedCounter()
+
+        self.catalogs: Dict[int, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def record_catalog(self, catalog_id: int, **counts: int) -> None:
+        with self._lock:
+            stats = self.catalogs.setdefault(catalog_id, {})
+
+            for key, value in counts.items():
+                stats[key] = stats.get(key, 0) + value
+
+    def snapshot(self) -> Dict[str, int]:
+        return {
+            "n": self.n.value,
+            "n_success": self.n_success.value,
+            "current_catalog": self.current_catalog.value,
+            "num_uploaded": self.num_uploaded.value,
+            "upload_bytes": self.upload_bytes.value,
+            "backoff_time": self.backoff_time.value,
+        }
@@ -0,0 +1,229 @@
+from typing import List, Dict, Iterable, Optional, TYPE_CHECKING
+
+import os, json, time, uuid, datetime, statistics
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+
+from .rows import RunRow, to_json_rows
+from .bigquery import load_table, upload
+from .enums import *
+
+if TYPE_CHECKING:
+    from google.cloud import bigquery
+    from .scraper import VintedScraper
+    from .vinted import Vinted
+
+
+class RunSummary:
+    def __init__(self, **params):
+        self.run_id = str(uuid.uuid4())
+        self.params = params
+        self.started_at = datetime.datetime.now()
+        self.stages: Dict[str, float] = defaultdict(float)
+
+        self._start_time = time.monotonic()
+
+    @contextmanager
+    def stage(self, name: str):
+        start_time = time.monotonic()
+
+        try:
+            yield
+        finally:
+            self.stages[name] += time.monotonic() - start_time
+
+    def collect(
+        self,
+        scrapers: Iterable["VintedScraper"],
+        vinted_clients: Iterable["Vinted"],
+        n_inserted: int = 0,
+    ) -> RunRow:
+        duration = time.monotonic() - self._start_time
+
+        requests, catalogs = {}, defaultdict(Counter)
+        n_parsed, n_unique, n_uploaded, upload_bytes, backoff_time = 0, 0, 0, 0, 0.0
+
+        for scraper in scrapers:
+            state = scraper.state.snapshot()
+
+            n_parsed += state["n"]
+            n_unique += state["n_success"]
+            n_uploaded += state["num_uploaded"]
+            upload_bytes += state["upload_bytes"]
+            backoff_time += state["backoff_time"]
+
+            for catalog_id, stats in scraper.state.catalogs.items():
+                catalogs[catalog_id].update(stats)
+
+        for vinted_client in vinted_clients:
+            counts = requests.setdefault(vinted_client.domain, Counter())
+
+            for status_code, count in vinted_client.status_counts.items():
+                counts[str(status_code)] += count
+
+            backoff_time += vinted_client.rate_limiter.total_wait
+
+        n_requests = sum(sum(counts.values()) for counts in requests.values())
+
+        return RunRow(
+            run_id=self.run_id,
+            started_at=self.started_at.isoformat(),
+            finished_at=datetime.datetime.now().isoformat(),
+            duration=duration,
+            params=json.dumps(self.params, default=str),
+            stages=json.dumps(self.stages),
+            requests=json.dumps(requests),
+            catalogs=json.dumps({str(key): value for key, value in catalogs.items()}),
+            n_requests=n_requests,
+            n_parsed=n_parsed,
+            n_unique=n_unique,
+            n_uploaded=n_uploaded,
+            n_inserted=n_inserted,
+            upload_bytes=upload_bytes,
+            backoff_time=backoff_time,
+            request_rate=n_requests / duration if duration > 0 else 0.0,
+        )
+
+
+class StdoutSummarySink:
+    def write(self, row: RunRow) -> bool:
+        print(json.dumps(to_json_rows([row])[0]))
+        return True
+
+    def history(self, limit: int = RUN_HISTORY_SCAN) -> List[Dict]:
+        return []
+
+
+class JsonlSummarySink:
+    def __init__(self, path: str = RUN_SUMMARY_PATH):
+        self.path = path
+
+    def write(self, row: RunRow) -> bool:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        try:
+            with open(self.path, "a", encoding="utf-8") as file:
+                file.write(json.dumps(to_json_rows([row])[0]) + "\n")
+            return True
+
+        except Exception as e:
+            print(e)
+            return False
+
+    def history(self, limit: int = RUN_HISTORY_SCAN) -> List[Dict]:
+        if not os.path.exists(self.path):
+            return []
+
+        rows = []
+
+        try:
+            with open(self.path, "r", encoding="utf-8") as file:
+                for line in file:
+                    if line.strip():
+                        rows.append(json.loads(line))
+
+        except Exception as e:
+            print(e)
+            return []
+
+        return rows[::-1][:limit]
+
+
+class BigQuerySummarySink:
+    def __init__(
+        self,
+        client: "bigquery.Client",
+        dataset_id: str = DATASET_ID,
+        table_id: str = RUNS_TABLE_ID,
+    ):
+        self.client = client
+        self.dataset_id = dataset_id
+        self.table_id = table_id
+
+    def write(self, row: RunRow) -> bool:
+        result = upload(
+            client=self.client,
+            dataset_id=self.dataset_id,
+            table_id=self.table_id,
+            rows=to_json_rows([row]),
+        )
+
+        return bool(result) and result.n_success == 1
+
+    def history(self, limit: int = RUN_HISTORY_SCAN) -> List[Dict]:
+        try:
+            return load_table(
+                client=self.client,
+                table_id=self.table_id,
+                dataset_id=self.dataset_id,
+                order_by="started_at",
+                descending=True,
+                limit=limit,
+            )
+
+        except Exception as e:
+            print(e)
+            return []
+
+
+def load_history(
+    sinks: List, params: Dict, limit: int = RUN_HISTORY_SIZE
+) -> List[Dict]:
+    params = json.loads(json.dumps(params, default=str))
+
+    for sink in sinks:
+        rows = [row for row in sink.history() if _is_comparable(row, params)]
+
+        if rows:
+            return rows[:limit]
+
+    return []
+
+
+def detect_regressions(
+    row: RunRow, history: List[Dict], threshold: float = RUN_REGRESSION_THRESHOLD
+) -> List[str]:
+    regressions = []
+
+    for metric in RUN_REGRESSION_METRICS:
+        values = [entry[metric] for entry in history if entry.get(metric) is not None]
+        if not values:
+            continue
+
+        baseline = statistics.median(values)
+        value = getattr(row, metric)
+
+        if baseline > 0 and value < baseline * (1 - threshold):
+            regressions.append(
+                f"{metric}: {value:.2f} vs median {baseline:.2f} "
+                f"over {len(values)} runs ({value / baseline - 1:+.0%})"
+            )
+
+    return regressions
+
+
+def _is_comparable(row: Dict, params: Dict) -> bool:
+    try:
+        row_params = json.loads(row.get("params") or "{}")
+    except ValueError:
+        return False
+
+    return all(row_params.get(key) == params.get(key) for key in RUN_COMPARE_PARAMS)
+
+
+def init_sinks(
+    names: List[str], client: Optional["bigquery.Client"] = None
+) -> List:
+    sinks = []
+
+    for name in names:
+        if name == "stdout":
+            sinks.append(StdoutSummarySink())
+        elif name == "jsonl":
+            sinks.append(JsonlSummarySink())
+        elif name == "bigquery" and client is not None:
+            sinks.append(BigQuerySummarySink(client))
+
+    return sinks
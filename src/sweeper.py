@@ -0,0 +1,110 @@
+from typing import List, Optional, Container, TYPE_CHECKING
+
+from concurrent.futures import ThreadPoolExecutor
+
+from .vinted import Vinted, VintedResponse
+from .bigquery import load_table, mark_checked, query_sweep_candidates
+from .utils import create_batches
+from .enums import *
+
+if TYPE_CHECKING:
+    from google.cloud import bigquery
+
+
+class AvailabilitySweeper:
+    def __init__(
+        self,
+        bq_client: "bigquery.Client",
+        vinted_client: Vinted,
+        budget: int = SWEEP_BUDGET,
+        workers: int = SWEEP_WORKERS,
+    ):
+        self.bq_client = bq_client
+        self.vinted_client = vinted_client
+        self.budget = budget
+        self.workers = workers
+
+        self.reset()
+
+    def reset(self):
+        self.num_requested = 0
+        self.num_skipped = 0
+        self.num_unavailable = 0
+        self.num_updated = 0
+
+    def run(self, seen: Optional[Container[str]] = None) -> int:
+        vinted_ids = self.load_candidates(seen)
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            results = list(executor.map(self._is_available, vinted_ids))
+
+        self.num_requested += len(vinted_ids)
+
+        checked = {
+            vinted_id: is_available
+            for vinted_id, is_available in zip(vinted_ids, results)
+            if is_available is not None
+        }
+        self.num_unavailable += sum(not value for value in checked.values())
+
+        for batch in create_batches(list(checked), SWEEP_DML_BATCH_SIZE):
+            unavailable = [vinted_id for vinted_id in batch if not checked[vinted_id]]
+
+            updated = mark_checked(
+                client=self.bq_client,
+                dataset_id=DATASET_ID,
+                table_id=ITEM_TABLE_ID,
+                vinted_ids=batch,
+                unavailable_ids=unavailable,
+            )
+
+            self.num_updated += max(updated, 0)
+
+        return self.num_updated
+
+    def load_candidates(self, seen: Optional[Container[str]] = None) -> List[str]:
+        rows = load_table(
+            client=self.bq_client,
+            query=query_sweep_candidates(self.vinted_client.domain),
+            fields=["vinted_id"],
+            order_by="priority",
+            descending=True,
+            limit=self.budget * 2 if seen else self.budget,
+        )
+
+        vinted_ids = []
+
+        for row in rows:
+            if seen and row["vinted_id"] in seen:
+                self.num_skipped += 1
+                continue
+
+            vinted_ids.append(row["vinted_id"])
+
+            if len(vinted_ids) >= self.budget:
+                break
+
+        return vinted_ids
+
+    def _is_available(self, vinted_id: str) -> Optional[bool]:
+        try:
+            response = self.vinted_client.item_info(vinted_id)
+        except Exception as e:
+            print(e)
+            return
+
+        return check_is_available(response)
+
+
+def check_is_available(response: VintedResponse) -> Optional[bool]:
+    if response.status_code == 404:
+        return False
+
+    if response.status_code != 200 or not isinstance(response.data, dict):
+        return
+
+    item = response.data.get("item")
+    if not item:
+        return False
+
+    return not (item.get("is_closed") or item.get("is_hidden") or item.get("is_draft"))
@@ -0,0 +1,103 @@
+from typing import List, Dict, Optional
+
+import os, json, random, threading
+
+from .enums import *
+
+
+class PageSizeTuner:
+    def __init__(
+        self,
+        path: str = PAGE_SIZE_TUNER_PATH,
+        candidates: List[int] = PAGE_SIZE_CANDIDATES,
+        explore: float = PAGE_SIZE_EXPLORE,
+        decay: float = PAGE_SIZE_DECAY,
+        rng: Optional[random.Random] = None,
+    ):
+        self.path = path
+        self.candidates = candidates
+        self.explore = explore
+        self.decay = decay
+        self.rng = rng or random.Random()
+
+        self._stats: Dict[str, Dict[str, Dict[str, float]]] = {}
+        self._lock = threading.Lock()
+
+    def load(self) -> int:
+        if not os.path.exists(self.path):
+            return 0
+
+        try:
+            with open(self.path, "r", encoding="utf-8") as file:
+                stats = json.load(file)
+        except Exception as e:
+            print(e)
+            return 0
+
+        with self._lock:
+            self._stats = stats
+
+        return len(stats)
+
+    def save(self) -> None:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with self._lock:
+            content = json.dumps(self._stats)
+
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            file.write(content)
+
+        os.replace(tmp_path, self.path)
+
+    def choose(self, catalog_id: int, rng: Optional[random.Random] = None) -> int:
+        with self._lock:
+            stats = self._stats.get(str(catalog_id), {})
+
+        untried = [size for size in self.candidates if str(size) not in stats]
+        if untried:
+            return max(untried)
+
+        rng = rng or self.rng
+
+        if rng.random() < self.explore:
+            return rng.choice(self.candidates)
+
+        return max(self.candidates, key=lambda size: stats[str(size)]["rate"])
+
+    def record(
+        self,
+        catalog_id: int,
+        per_page: int,
+        elapsed: float,
+        n_bytes: int,
+        n_new: int,
+    ) -> None:
+        observation = {"new": n_new, "elapsed": elapsed, "bytes": n_bytes}
+
+        with self._lock:
+            stats = self._stats.setdefault(str(catalog_id), {})
+            previous = stats.get(str(per_page))
+
+            if previous is None:
+                previous = stats[str(per_page)] = dict(observation, n=1)
+            else:
+                for key, value in observation.items():
+                    previous[key] += self.decay * (value - previous[key])
+
+                previous["n"] += 1
+
+            elapsed = previous["elapsed"]
+            previous["rate"] = previous["new"] / elapsed if elapsed > 0 else 0.0
+
+    def best(self, catalog_id: int) -> Optional[int]:
+        with self._lock:
+            stats = self._stats.get(str(catalog_id))
+
+        if not stats:
+            return
+
+        return int(max(stats, key=lambda size: stats[size]["rate"]))
@@ -1,15 +1,19 @@
 from typing import List, Dict, Optional, Tuple
 
 import random, time, json
-from copy import deepcopy
 from datetime import datetime
+from .vinted.models import SearchKey
 from .enums import N_ITEMS_MAX, VINTAGE_BRAND_ID
 
 
-def random_sleep(min_sleep: int = 1, max_sleep: int = 10) -> None:
-    sleep_time = random.randint(min_sleep, max_sleep)
+def random_sleep(
+    min_sleep: int = 1, max_sleep: int = 10, rng: Optional[random.Random] = None
+) -> int:
+    sleep_time = (rng or random).randint(min_sleep, max_sleep)
     time.sleep(sleep_time)
 
+    return sleep_time
+
 
 def create_batches(input_list: List, batch_size: int) -> List[List]:
     batches = []
@@ -21,38 +25,52 @@ def create_batches(input_list: List, batch_size: int) -> List[List]:
     return batches
 
 
-def prepare_search_kwargs(
+def prepare_search_keys(
     catalog_id: int,
     filters: Dict,
     filter_key: Optional[str] = None,
     batch_size: int = 1,
     max_filter_options: Optional[int] = 10,
     only_vintage: bool = False,
-) -> List[Dict]:
-    base_search_kwargs = {"catalog_ids": [catalog_id], "per_page": N_ITEMS_MAX}
+    per_page: int = N_ITEMS_MAX,
+    rng: Optional[random.Random] = None,
+) -> List[SearchKey]:
+    pages = range(1, max(N_ITEMS_MAX // per_page, 1) + 1)
 
     if only_vintage:
-        filter_search_kwargs = deepcopy(base_search_kwargs)
-        filter_search_kwargs["brand_ids"] = [VINTAGE_BRAND_ID]
-
-        return [filter_search_kwargs]
+        return [
+            SearchKey(
+                catalog_id=catalog_id,
+                filter_key="brand",
+                filter_ids=(VINTAGE_BRAND_ID,),
+                page=page,
+                per_page=per_page,
+            )
+            for page in pages
+        ]
 
     filter_options = filters.get(filter_key, {}).get("id", [])
-    filter_options = _select_filter_options(filter_options, max_filter_options)
+    filter_options = _select_filter_options(filter_options, max_filter_options, rng)
 
     if filter_options:
-        search_kwargs = []
-        random.shuffle(filter_options)
-        filter_options = create_batches(filter_options, batch_size)
-
-        for batch_filter_options in filter_options:
-            filter_search_kwargs = deepcopy(base_search_kwargs)
-            filter_search_kwargs[f"{filter_key}_ids"] = batch_filter_options
-            search_kwargs.append(filter_search_kwargs)
-
-        return search_kwargs
+        (rng or random).shuffle(filter_options)
+
+        return [
+            SearchKey(
+                catalog_id=catalog_id,
+                filter_key=filter_key,
+                filter_ids=tuple(batch_filter_options),
+                page=page,
+                per_page=per_page,
+            )
+            for batch_filter_options in create_batches(filter_options, batch_size)
+            for page in pages
+        ]
 
-    return [base_search_kwargs]
+    return [
+        SearchKey(catalog_id=catalog_id, page=page, per_page=per_page)
+        for page in pages
+    ]
 
 
 def update_filter_entries(
@@ -85,10 +103,12 @@ def save_to_jsonl(data_list: List[Dict], filename: str, append: bool = False) ->
             file.write(json_str + "\n")
 
 
-def _select_filter_options(options: List[int], n: Optional[int] = None) -> List[int]:
+def _select_filter_options(
+    options: List[int], n: Optional[int] = None, rng: Optional[random.Random] = None
+) -> List[int]:
     if n is None:
         return options
 
     n = min(n, len(options))
 
-    return random.sample(options, n)
+    return (rng or random).sample(options, n)
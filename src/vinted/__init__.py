@@ -1,2 +1,3 @@
 from .client import Vinted
-from .models import VintedResponse
+from .models import VintedResponse, SearchKey
+from .ratelimit import RateLimiter
@@ -0,0 +1,103 @@
+from collections import deque
+
+import threading, time
+
+from .enums import (
+    BREAKER_WINDOW,
+    BREAKER_ERROR_RATE,
+    BREAKER_MIN_REQUESTS,
+    BREAKER_COOLDOWN,
+    BREAKER_MAX_COOLDOWN,
+    BREAKER_PROBES,
+)
+
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    def __init__(
+        self,
+        window: int = BREAKER_WINDOW,
+        error_rate: float = BREAKER_ERROR_RATE,
+        min_requests: int = BREAKER_MIN_REQUESTS,
+        cooldown: float = BREAKER_COOLDOWN,
+        max_cooldown: float = BREAKER_MAX_COOLDOWN,
+        probes: int = BREAKER_PROBES,
+    ) -> None:
+        self.error_rate = error_rate
+        self.min_requests = min_requests
+        self.base_cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.probes = probes
+
+        self.state = CLOSED
+        self.cooldown = cooldown
+        self.num_rejected = 0
+        self.num_opened = 0
+
+        self._results = deque(maxlen=window)
+        self._opened_at = 0.0
+        self._in_flight_probes = 0
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == OPEN:
+                if time.monotonic() - self._opened_at < self.cooldown:
+                    self.num_rejected += 1
+                    return False
+
+                self.state = HALF_OPEN
+                self._in_flight_probes = 0
+
+            if self.state == HALF_OPEN:
+                if self._in_flight_probes >= self.probes:
+                    self.num_rejected += 1
+                    return False
+
+                self._in_flight_probes += 1
+
+            return True
+
+    def retry_after(self) -> float:
+        with self._lock:
+            if self.state != OPEN:
+                return 0.0
+
+            return max(self.cooldown - (time.monotonic() - self._opened_at), 0.0)
+
+    def record(self, success: bool) -> None:
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self._in_flight_probes = max(self._in_flight_probes - 1, 0)
+
+                if success:
+                    self.state = CLOSED
+                    self.cooldown = self.base_cooldown
+                    self._results.clear()
+                else:
+                    self._open(min(self.cooldown * 2, self.max_cooldown))
+
+                return
+
+            self._results.append(success)
+
+            if self.state == CLOSED and len(self._results) >= self.min_requests:
+                n_errors = self._results.count(False)
+
+                if n_errors / len(self._results) >= self.error_rate:
+                    self._open(self.cooldown)
+
+    def _open(self, cooldown: float) -> None:
+        self.state = OPEN
+        self.cooldown = cooldown
+        self._opened_at = time.monotonic()
+        self._results.clear()
+        self.num_opened += 1
+
+
+def is_failure(status_code: int) -> bool:
+    return status_code in (403, 429) or status_code >= 500
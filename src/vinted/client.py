@@ -1,29 +1,71 @@
-from typing import List, Literal, Dict
+from typing import List, Literal, Dict, Optional
 
 import requests
-import time
+import time, threading
+from collections import Counter
 
 from .endpoints import Endpoints
 from .utils import parse_url_to_params
-from .models import VintedResponse
-from .enums import Domain, SortOption, USER_AGENT
+from .models import VintedResponse, SearchKey
+from .ratelimit import RateLimiter
+from .singleflight import SingleFlight
+from .stream import iter_json_items
+from .breaker import CircuitBreaker, is_failure
+from .enums import Domain, SortOption, USER_AGENT, STREAM_CHUNK_SIZE, CIRCUIT_OPEN
 
 
 class Vinted:
-    def __init__(self, domain: Domain = "fr") -> None:
+    def __init__(
+        self, domain: Domain = "fr", rate_limiter: Optional[RateLimiter] = None
+    ) -> None:
+        self.domain = domain
         self.base_url = f"https://www.vinted.{domain}"
         self.api_url = f"{self.base_url}/api/v2"
         self.headers = {"User-Agent": USER_AGENT}
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        self.in_flight = SingleFlight()
+        self.status_counts = Counter()
+        self.breakers: Dict[Endpoints, CircuitBreaker] = {}
+        self._lock = threading.Lock()
         self.cookies = self.fetch_cookies()
 
     def fetch_cookies(self):
-        response = requests.get(self.base_url, headers=self.headers)
+        response = self.session.get(self.base_url)
         return response.cookies
 
     def _call(self, method: Literal["get"], *args, **kwargs):
-        return requests.request(
-            method=method, headers=self.headers, cookies=self.cookies, *args, **kwargs
-        )
+        self.rate_limiter.acquire()
+        response = self.session.request(method=method, *args, **kwargs)
+
+        with self._lock:
+            self.status_counts[response.status_code] += 1
+
+        return response
+
+    def breaker(self, endpoint: Endpoints) -> CircuitBreaker:
+        with self._lock:
+            if endpoint not in self.breakers:
+                self.breakers[endpoint] = CircuitBreaker()
+
+            return self.breakers[endpoint]
+
+    def _guarded_call(self, endpoint: Endpoints, *args, **kwargs):
+        breaker = self.breaker(endpoint)
+
+        if not breaker.allow():
+            return
+
+        try:
+            response = self._call(*args, **kwargs)
+        except requests.exceptions.RequestException:
+            breaker.record(False)
+            raise
+
+        breaker.record(not is_failure(response.status_code))
+
+        return response
 
     def _get(
         self,
@@ -37,18 +79,63 @@ class Vinted:
         else:
             url = self.api_url + endpoint.value
 
-        response = self._call(method="get", url=url, *args, **kwargs)
+        response = self._guarded_call(endpoint, method="get", url=url, *args, **kwargs)
+
+        if response is None:
+            return VintedResponse(status_code=CIRCUIT_OPEN)
+
+        n_bytes = len(response.content)
 
         if response.status_code == 200:
             try:
                 return VintedResponse(
-                    status_code=response.status_code, data=response.json()
+                    status_code=response.status_code,
+                    data=response.json(),
+                    n_bytes=n_bytes,
                 )
             except requests.exceptions.JSONDecodeError:
-                return VintedResponse(status_code=response.status_code)
+                return VintedResponse(status_code=response.status_code, n_bytes=n_bytes)
         else:
+            return VintedResponse(status_code=response.status_code, n_bytes=n_bytes)
+
+    def _stream(
+        self, endpoint: Endpoints, key: str = "items", *args, **kwargs
+    ) -> VintedResponse:
+        url = self.api_url + endpoint.value
+        response = self._guarded_call(
+            endpoint, method="get", url=url, stream=True, *args, **kwargs
+        )
+
+        if response is None:
+            return VintedResponse(status_code=CIRCUIT_OPEN)
+
+        if response.status_code != 200:
+            response.close()
             return VintedResponse(status_code=response.status_code)
 
+        result = VintedResponse(status_code=response.status_code)
+        result.data = {key: self._iter_items(endpoint, response, result, key)}
+
+        return result
+
+    def _iter_items(
+        self,
+        endpoint: Endpoints,
+        response: requests.Response,
+        result: VintedResponse,
+        key: str,
+    ):
+        try:
+            yield from iter_json_items(
+                response.iter_content(chunk_size=STREAM_CHUNK_SIZE), key
+            )
+        except requests.exceptions.RequestException as e:
+            print(e)
+            result.error = str(e)
+            self.breaker(endpoint).record(False)
+        finally:
+            response.close()
+
     def search(
         self,
         url: str = None,
@@ -87,6 +174,19 @@ class Vinted:
 
         return self._get(Endpoints.CATALOG_ITEMS, params=params)
 
+    def search_key(self, key: SearchKey, stream: bool = False) -> VintedResponse:
+        if stream:
+            return self._stream(
+                Endpoints.CATALOG_ITEMS, params=f"{key.query}&time={time.time()}"
+            )
+
+        return self.in_flight.do(
+            key,
+            lambda: self._get(
+                Endpoints.CATALOG_ITEMS, params=f"{key.query}&time={time.time()}"
+            ),
+        )
+
     def search_users(
         self, query: str, page: int = 1, per_page: int = 36
     ) -> VintedResponse:
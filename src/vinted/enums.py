@@ -34,3 +34,13 @@ SortOption = Literal[
 ]
 
 USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/128.0.0.0 Safari/537.36"
+
+STREAM_CHUNK_SIZE = 64 * 1024
+
+CIRCUIT_OPEN = -1
+BREAKER_WINDOW = 20
+BREAKER_ERROR_RATE = 0.5
+BREAKER_MIN_REQUESTS = 5
+BREAKER_COOLDOWN = 30
+BREAKER_MAX_COOLDOWN = 600
+BREAKER_PROBES = 1
@@ -1,17 +1,21 @@
-from typing import Dict, Optional
-from dataclasses import dataclass
+from typing import Dict, Tuple, Optional
+from dataclasses import dataclass, field
 from datetime import datetime
+from urllib.parse import urlencode
+import hashlib
 
-from .enums import Domain, ROOT_URL
+from .enums import Domain, SortOption, ROOT_URL
 
 
 @dataclass
 class VintedResponse:
     status_code: int
     data: Optional[Dict] = None
+    n_bytes: int = 0
+    error: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class VintedCatalog:
     id: int
     title: str
@@ -21,10 +25,79 @@ class VintedCatalog:
     domain: Domain = "fr"
     is_valid: bool = True
     is_active: bool = True
+    parent_id: Optional[int] = None
+    depth: int = 0
+    created_at: Optional[str] = None
+    hash: Optional[str] = None
 
     def __post_init__(self):
-        self.created_at = datetime.now().isoformat()
+        if self.created_at is None:
+            self.created_at = datetime.now().isoformat()
         self.url = ROOT_URL(self.domain) + self.url
+        self.hash = self.content_hash()
+
+    def content_hash(self) -> str:
+        content = "|".join(
+            str(value)
+            for value in (self.title, self.code, self.url, self.women, self.parent_id)
+        )
+        return hashlib.sha1(content.encode("utf-8")).hexdigest()[:16]
 
     def to_dict(self) -> Dict:
-        return self.__dict__
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+@dataclass(frozen=True, slots=True)
+class SearchKey:
+    catalog_id: int
+    filter_key: Optional[str] = None
+    filter_ids: Tuple[int, ...] = ()
+    page: int = 1
+    per_page: int = 96
+    order: SortOption = "newest_first"
+    query: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        params = [
+            ("page", self.page),
+            ("per_page", self.per_page),
+            ("catalog_ids", self.catalog_id),
+            ("order", self.order),
+        ]
+
+        if self.filter_key and self.filter_ids:
+            params.append(
+                (f"{self.filter_key}_ids", ",".join(map(str, self.filter_ids)))
+            )
+
+        object.__setattr__(self, "query", urlencode(params, safe=","))
+
+    def to_kwargs(self) -> Dict:
+        kwargs = {
+            "catalog_ids": [self.catalog_id],
+            "page": self.page,
+            "per_page": self.per_page,
+            "order": self.order,
+        }
+
+        if self.filter_key and self.filter_ids:
+            kwargs[f"{self.filter_key}_ids"] = list(self.filter_ids)
+
+        return kwargs
+
+    @classmethod
+    def from_kwargs(cls, kwargs: Dict) -> "SearchKey":
+        filter_key, filter_ids = None, ()
+
+        for key, value in kwargs.items():
+            if key.endswith("_ids") and key != "catalog_ids" and value:
+                filter_key, filter_ids = key[: -len("_ids")], tuple(value)
+
+        return cls(
+            catalog_id=kwargs["catalog_ids"][0],
+            filter_key=filter_key,
+            filter_ids=filter_ids,
+            page=kwargs.get("page", 1),
+            per_page=kwargs.get("per_page", 96),
+            order=kwargs.get("order", "newest_first"),
+        )
@@ -0,0 +1,188 @@
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import re
+import numpy as np
+
+
+BRAND_MAX_LENGTH = 35
+OUTLIER_THRESHOLD = 3.5
+ECB_RATES_URL = "https://www.ecb.europa.eu/stats/eurofxref/eurofxref-daily.xml"
+ECB_CUBE = "{http://www.ecb.int/vocabulary/2002-08-01/eurofxref}Cube"
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def factorize(values: Sequence[Optional[str]]) -> Tuple[np.ndarray, np.ndarray]:
+    index = {}
+    inverse = np.fromiter(
+        (index.setdefault(value or "", len(index)) for value in values),
+        dtype=np.intp,
+        count=len(values),
+    )
+
+    return np.array(list(index), dtype=str), inverse
+
+
+def normalize_sizes(sizes: Sequence[Optional[str]]) -> np.ndarray:
+    uniques, inverse = factorize(sizes)
+
+    if len(uniques) == 0:
+        return np.empty(0, dtype=object)
+
+    normalized = np.char.replace(np.char.partition(uniques, " / ")[:, 0], ",", ".")
+    normalized = np.where(normalized == "", None, normalized.astype(object))
+
+    return normalized[inverse]
+
+
+def clean_titles(titles: Sequence[Optional[str]]) -> np.ndarray:
+    uniques, inverse = factorize(titles)
+
+    cleaned = np.array(
+        [_WHITESPACE.sub(" ", title).strip() or None for title in uniques],
+        dtype=object,
+    )
+
+    return cleaned[inverse]
+
+
+def canonicalize_brands(
+    brands: Sequence[Optional[str]],
+    lookup: Optional[Dict[str, str]] = None,
+    max_length: int = BRAND_MAX_LENGTH,
+) -> Tuple[np.ndarray, np.ndarray]:
+    uniques, inverse = factorize(brands)
+    stripped = np.char.strip(uniques)
+    lengths = np.char.str_len(stripped)
+
+    if lookup:
+        keys = np.char.lower(stripped)
+        canonical = np.array(
+            [lookup.get(key, brand) for key, brand in zip(keys, stripped)],
+            dtype=object,
+        )
+    else:
+        canonical = stripped.astype(object)
+
+    canonical = np.where(lengths == 0, None, canonical)
+    valid = lengths < max_length
+
+    return canonical[inverse], valid[inverse]
+
+
+def fetch_rates(url: str = ECB_RATES_URL, timeout: float = 30) -> Dict[str, float]:
+    import requests
+    from xml.etree import ElementTree
+
+    response = requests.get(url, timeout=timeout)
+    response.raise_for_status()
+
+    rates = {
+        cube.get("currency"): 1.0 / float(cube.get("rate"))
+        for cube in ElementTree.fromstring(response.content).iter(ECB_CUBE)
+        if cube.get("currency") and cube.get("rate")
+    }
+
+    if not rates:
+        raise ValueError(f"No exchange rates found at {url}")
+
+    return rates
+
+
+def convert_prices(
+    prices: Sequence[Optional[float]],
+    currencies: Sequence[Optional[str]],
+    rates: Dict[str, float],
+    target_currency: str = "EUR",
+) -> np.ndarray:
+    values = np.asarray(prices, dtype=float)
+    uniques, inverse = factorize(currencies)
+
+    unique_rates = np.array(
+        [
+            1.0 if currency == target_currency else rates.get(currency, np.nan)
+            for currency in uniques
+        ],
+        dtype=float,
+    )
+
+    return values * unique_rates[inverse]
+
+
+def flag_outliers(
+    values: Sequence[Optional[float]],
+    groups: Optional[Sequence[Any]] = None,
+    threshold: float = OUTLIER_THRESHOLD,
+) -> np.ndarray:
+    values = np.asarray(values, dtype=float)
+    flags = np.zeros(len(values), dtype=bool)
+
+    if len(values) == 0:
+        return flags
+
+    if groups is None:
+        partitions = [np.arange(len(values))]
+    else:
+        _, group_index = np.unique(np.asarray(groups), return_inverse=True)
+        order = np.argsort(group_index, kind="stable")
+        splits = np.flatnonzero(np.diff(group_index[order])) + 1
+        partitions = np.split(order, splits)
+
+    for index in partitions:
+        group_values = values[index]
+
+        if np.isnan(group_values).all():
+            continue
+
+        median = np.nanmedian(group_values)
+        mad = np.nanmedian(np.abs(group_values - median))
+
+        if not mad:
+            continue
+
+        scores = 0.6745 * np.abs(group_values - median) / mad
+        flags[index] = scores > threshold
+
+    return flags
+
+
+def transform_item_rows(
+    rows: Sequence[Any],
+    rates: Optional[Dict[str, float]] = None,
+    brand_lookup: Optional[Dict[str, str]] = None,
+    target_currency: str = "EUR",
+) -> Dict[str, np.ndarray]:
+    if not rows:
+        return {}
+
+    titles = clean_titles([row.title for row in rows])
+    sizes = normalize_sizes([row.size for row in rows])
+    brands, brand_valid = canonicalize_brands(
+        [row.brand for row in rows], brand_lookup
+    )
+
+    prices = convert_prices(
+        [row.price for row in rows],
+        [row.currency for row in rows],
+        rates or {},
+        target_currency,
+    )
+    price_outlier = flag_outliers(prices, [row.catalog_id for row in rows])
+
+    for row, title, size, brand, valid, price, outlier in zip(
+        rows, titles, sizes, brands, brand_valid, prices, price_outlier
+    ):
+        row.title = title
+        row.size = size
+        row.brand = brand if valid else None
+        row.price_outlier = bool(outlier)
+
+        if not np.isnan(price):
+            row.fx_price = round(float(price), 2)
+            row.fx_currency = target_currency
+
+    return {
+        "price": prices,
+        "brand_valid": brand_valid,
+        "price_outlier": price_outlier,
+    }
@@ -0,0 +1,35 @@
+from typing import Optional
+
+import threading, time
+
+
+class RateLimiter:
+    def __init__(self, rate: Optional[float] = None, burst: int = 1) -> None:
+        self.rate = rate
+        self.capacity = max(burst, 1)
+
+        self._tokens = float(self.capacity)
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+        self.total_wait = 0.0
+
+    def acquire(self) -> float:
+        if not self.rate:
+            return 0.0
+
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._updated_at) * self.rate
+            )
+            self._updated_at = now
+
+            wait_time = max(0.0, (1 - self._tokens) / self.rate)
+            self._tokens -= 1
+            self.total_wait += wait_time
+
+        if wait_time > 0:
+            time.sleep(wait_time)
+
+        return wait_time
@@ -0,0 +1,34 @@
+from typing import Any, Callable, Dict, Hashable
+
+import threading
+from concurrent.futures import Future
+
+
+class SingleFlight:
+    def __init__(self) -> None:
+        self._calls: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+        self.num_shared = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            future = self._calls.get(key)
+            is_leader = future is None
+
+            if is_leader:
+                future = self._calls[key] = Future()
+            else:
+                self.num_shared += 1
+
+        if not is_leader:
+            return future.result()
+
+        try:
+            future.set_result(fn())
+        except BaseException as e:
+            future.set_exception(e)
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+        return future.result()
@@ -0,0 +1,59 @@
+from typing import Dict, Iterable, Iterator
+
+import re, json, codecs
+
+
+_WHITESPACE = re.compile(r"[\s,]*")
+_DELIMITER = re.compile(r"[\s,\]]")
+_decoder = json.JSONDecoder()
+
+
+def iter_json_items(chunks: Iterable[bytes], key: str = "items") -> Iterator[Dict]:
+    marker = re.compile(rf'"{re.escape(key)}"\s*:\s*\[')
+    text_decoder = codecs.getincrementaldecoder("utf-8")()
+    chunks = iter(chunks)
+
+    buffer, position, is_open = "", 0, False
+
+    for chunk in chunks:
+        buffer += text_decoder.decode(chunk)
+
+        if not is_open:
+            match = marker.search(buffer)
+            if not match:
+                continue
+
+            buffer, position, is_open = buffer[match.end() :], 0, True
+
+        while True:
+            position = _WHITESPACE.match(buffer, position).end()
+
+            if position >= len(buffer):
+                break
+
+            if buffer[position] == "]":
+                return
+
+            try:
+                item, end = _decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                break
+
+            if not _DELIMITER.match(buffer, end):
+                break
+
+            position = end
+            yield item
+
+        buffer, position = buffer[position:], 0
+
+    if not is_open:
+        buffer += text_decoder.decode(b"", final=True)
+
+        try:
+            data = json.loads(buffer)
+        except json.JSONDecodeError:
+            return
+
+        if isinstance(data, dict):
+            yield from data.get(key) or []
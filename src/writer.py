@@ -0,0 +1,75 @@
+from typing import List, Dict, TYPE_CHECKING
+
+import time, threading
+from concurrent.futures import ThreadPoolExecutor, Future
+
+from .bigquery import UploadResult, upload
+from .enums import *
+
+if TYPE_CHECKING:
+    from google.cloud import bigquery
+
+
+class UploadExecutor:
+    def __init__(
+        self,
+        client: "bigquery.Client",
+        workers: int = UPLOAD_WORKERS,
+        max_in_flight: int = UPLOAD_MAX_IN_FLIGHT,
+    ):
+        self.client = client
+        self.max_in_flight = max_in_flight
+
+        self._executor = ThreadPoolExecutor(max_workers=workers)
+        self._slots = threading.BoundedSemaphore(max_in_flight)
+        self._lock = threading.Lock()
+
+        self.num_submitted = 0
+        self.wait_time = 0.0
+
+    def submit(
+        self, table_id: str, rows: List[Dict], dataset_id: str = DATASET_ID
+    ) -> Future:
+        start_time = time.monotonic()
+        self._slots.acquire()
+
+        with self._lock:
+            self.num_submitted += 1
+            self.wait_time += time.monotonic() - start_time
+
+        try:
+            future = self._executor.submit(
+                upload,
+                client=self.client,
+                dataset_id=dataset_id,
+                table_id=table_id,
+                rows=rows,
+            )
+        except Exception:
+            self._slots.release()
+            raise
+
+        future.add_done_callback(lambda _: self._slots.release())
+
+        return future
+
+    def upload_many(self, tables: Dict[str, List[Dict]]) -> Dict[str, UploadResult]:
+        futures = {
+            table_id: self.submit(table_id, rows)
+            for table_id, rows in tables.items()
+            if rows
+        }
+
+        results = {}
+
+        for table_id, future in futures.items():
+            try:
+                results[table_id] = future.result()
+            except Exception as e:
+                print(e)
+                results[table_id] = UploadResult(failed=tables[table_id])
+
+        return results
+
+    def shutdown(self, wait: bool = True):
+        self._executor.shutdown(wait=wait)
@@ -0,0 +1,126 @@
+import pytest
+
+from src.vinted import breaker as breaker_module
+from src.vinted.breaker import CircuitBreaker, CLOSED, OPEN, HALF_OPEN, is_failure
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(breaker_module.time, "monotonic", clock)
+    return clock
+
+
+def make_breaker(**kwargs):
+    params = dict(window=4, error_rate=0.5, min_requests=4, cooldown=10, probes=1)
+    params.update(kwargs)
+    return CircuitBreaker(max_cooldown=40, **params)
+
+
+def test_stays_closed_below_min_requests(clock):
+    breaker = make_breaker()
+
+    for _ in range(3):
+        assert breaker.allow()
+        breaker.record(False)
+
+    assert breaker.state == CLOSED
+
+
+def test_opens_at_error_rate_and_rejects_during_cooldown(clock):
+    breaker = make_breaker()
+
+    for success in [True, True, False, False]:
+        breaker.record(success)
+
+    assert breaker.state == OPEN
+    assert breaker.num_opened == 1
+    assert not breaker.allow()
+    assert breaker.num_rejected == 1
+
+    clock.now += 4
+    assert breaker.retry_after() == pytest.approx(6)
+
+
+def test_half_open_probe_success_closes(clock):
+    breaker = make_breaker()
+
+    for _ in range(4):
+        breaker.record(False)
+
+    clock.now += 10
+    assert breaker.retry_after() == 0
+    assert breaker.allow()
+    assert breaker.state == HALF_OPEN
+    assert not breaker.allow()
+
+    breaker.record(True)
+    assert breaker.state == CLOSED
+    assert breaker.cooldown == 10
+    assert breaker.allow()
+
+
+def test_half_open_probe_failure_doubles_cooldown_up_to_max(clock):
+    breaker = make_breaker()
+
+    for _ in range(4):
+        breaker.record(False)
+
+    for cooldown in [20, 40, 40]:
+        clock.now += breaker.cooldown
+        assert breaker.allow()
+
+        breaker.record(False)
+        assert breaker.state == OPEN
+        assert breaker.cooldown == cooldown
+
+
+@pytest.mark.parametrize(
+    "status_code, failure",
+    [(200, False), (404, False), (403, True), (429, True), (500, True), (503, True)],
+)
+def test_is_failure(status_code, failure):
+    assert is_failure(status_code) is failure
+
+
+def test_scraper_waits_for_open_circuit(clock, monkeypatch):
+    from src.scraper import VintedScraper
+    from src.vinted import VintedResponse
+    from src.vinted.enums import CIRCUIT_OPEN
+
+    class FakeClient:
+        domain = "fr"
+
+        def __init__(self):
+            self.circuit = make_breaker()
+
+        def breaker(self, endpoint):
+            return self.circuit
+
+    def sleep(seconds):
+        clock.now += seconds
+
+    monkeypatch.setattr("src.scraper.time.sleep", sleep)
+
+    client = FakeClient()
+    for _ in range(4):
+        client.circuit.record(False)
+
+    def request():
+        if not client.circuit.allow():
+            return VintedResponse(status_code=CIRCUIT_OPEN)
+        return VintedResponse(status_code=200, data={"items": []})
+
+    scraper = VintedScraper(bq_client=None, vinted_client=client)
+    response = scraper._call(None, request)
+
+    assert response.status_code == 200
+    assert scraper.state.backoff_time.value == pytest.approx(10)
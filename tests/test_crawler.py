@@ -0,0 +1,15 @@
+from src.crawler import SellerFrontier
+
+
+def test_shared_frontier_does_not_return_crawled_sellers():
+    frontier = SellerFrontier()
+
+    for seller_id, likes in [(1, 10), (2, 0), (1, 5)]:
+        frontier.observe({"user_id": seller_id, "favourite_count": likes})
+
+    assert frontier.pop(1) == [1]
+
+    frontier.observe({"user_id": 1, "favourite_count": 50})
+
+    assert frontier.pop(2) == [2]
+    assert len(frontier) == 0
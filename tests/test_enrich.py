@@ -0,0 +1,73 @@
+from types import SimpleNamespace
+
+import pytest
+
+from src import enrich
+from src.enrich import ItemEnricher, MISSING
+from src.enums import ENRICHMENT_RATE_LIMIT
+
+
+class FakeVinted:
+    def __init__(self, domain):
+        self.domain = domain
+        self.requested = []
+
+    def item_info(self, vinted_id):
+        self.requested.append(vinted_id)
+        return SimpleNamespace(status_code=404, data=None)
+
+
+@pytest.fixture(autouse=True)
+def offline(monkeypatch):
+    monkeypatch.setattr(enrich.Vinted, "fetch_cookies", lambda self: None)
+
+
+def make_enricher(monkeypatch, rows):
+    uploads = []
+
+    monkeypatch.setattr(enrich, "load_table", lambda client, query, **kwargs: rows)
+    monkeypatch.setattr(
+        enrich,
+        "upload",
+        lambda **kwargs: uploads.append(kwargs["rows"])
+        or SimpleNamespace(n_success=len(kwargs["rows"])),
+    )
+
+    enricher = ItemEnricher(None, ["fr", "de"])
+    enricher.vinted_clients = {domain: FakeVinted(domain) for domain in ["fr", "de"]}
+
+    return enricher, uploads
+
+
+def test_each_domain_gets_its_own_rate_budget():
+    enricher = ItemEnricher(None, ["fr", "de"])
+
+    fr, de = enricher.vinted_clients["fr"], enricher.vinted_clients["de"]
+
+    assert fr.rate_limiter is not de.rate_limiter
+    assert fr.rate_limiter.rate == ENRICHMENT_RATE_LIMIT
+
+
+def test_pending_items_are_fetched_with_their_domain_client(monkeypatch):
+    rows = [
+        {"vinted_id": "1", "domain": "fr"},
+        {"vinted_id": "2", "domain": "de"},
+        {"vinted_id": "3", "domain": "de"},
+    ]
+    enricher, uploads = make_enricher(monkeypatch, rows)
+
+    enricher.run()
+
+    assert enricher.vinted_clients["fr"].requested == ["1"]
+    assert enricher.vinted_clients["de"].requested == ["2", "3"]
+    assert enricher.num_tombstoned == 3
+    assert all(row["status"] == MISSING for batch in uploads for row in batch)
+
+
+def test_items_without_a_client_are_not_tombstoned(monkeypatch):
+    enricher, uploads = make_enricher(monkeypatch, [])
+
+    enricher.run(vinted_ids={"it": ["1"]})
+
+    assert enricher.num_requested == 0
+    assert uploads == []
@@ -0,0 +1,75 @@
+import os
+
+from src.images import ImageFetcher
+from src.rows import ImageRow
+
+
+class FakeResponse:
+    def __init__(self, body, headers):
+        self.body = body
+        self.headers = headers
+        self.status_code = 200
+
+    def iter_content(self, chunk_size):
+        for start in range(0, len(self.body), chunk_size):
+            yield self.body[start : start + chunk_size]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+
+class FakeSession:
+    def __init__(self, response):
+        self.response = response
+
+    def get(self, url, **kwargs):
+        return self.response
+
+    def close(self):
+        pass
+
+
+def make_fetcher(tmp_path, response, max_inflight_bytes):
+    fetcher = ImageFetcher(
+        None, str(tmp_path), workers=1, max_inflight_bytes=max_inflight_bytes
+    )
+    fetcher.session = FakeSession(response)
+    fetcher.chunk_size = 4
+    return fetcher
+
+
+def make_entry():
+    return ImageRow(
+        id="uuid",
+        vinted_id="42",
+        url="https://img/42.jpeg",
+        nobg=False,
+        size="original",
+        created_at="",
+    )
+
+
+def test_blob_rows_are_keyed_by_item_and_url(tmp_path):
+    response = FakeResponse(b"image", {"Content-Type": "image/jpeg"})
+    row = make_fetcher(tmp_path, response, 1024).fetch(make_entry())
+
+    assert (row.vinted_id, row.url) == ("42", "https://img/42.jpeg")
+    assert os.path.exists(os.path.join(str(tmp_path), row.path))
+
+
+def test_body_over_budget_is_rejected(tmp_path):
+    response = FakeResponse(b"x" * 64, {})
+    fetcher = make_fetcher(tmp_path, response, 16)
+
+    assert fetcher.fetch(make_entry()) is None
+    assert fetcher._budget.in_flight == 0
+    assert os.listdir(str(tmp_path)) == []
+
+
+def test_body_over_declared_length_is_rejected(tmp_path):
+    response = FakeResponse(b"x" * 64, {"Content-Length": "8"})
+
+    assert make_fetcher(tmp_path, response, 1024).fetch(make_entry()) is None
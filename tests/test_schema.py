@@ -0,0 +1,33 @@
+from dataclasses import fields
+
+import pytest
+
+from src import rows, schema
+from src.enums import *
+
+
+@pytest.mark.parametrize(
+    "table_id, row_type",
+    [
+        (PRICE_HISTORY_TABLE_ID, rows.PriceHistoryRow),
+        (ITEM_ENRICHMENT_TABLE_ID, rows.ItemEnrichmentRow),
+        (IMAGE_BLOB_TABLE_ID, rows.ImageBlobRow),
+        (RUNS_TABLE_ID, rows.RunRow),
+    ],
+)
+def test_new_tables_match_rows(table_id, row_type):
+    columns = [name for name, _ in schema.NEW_TABLES[table_id]]
+
+    assert columns == [field.name for field in fields(row_type)]
+
+
+def test_added_item_columns_exist_on_rows():
+    item_fields = {field.name for field in fields(rows.ItemRow)}
+
+    for name, _ in schema.ADDED_COLUMNS[ITEM_TABLE_ID]:
+        assert name in item_fields or name == "checked_at"
+
+
+def test_migrations_are_idempotent():
+    for statement in schema.migrations():
+        assert "IF NOT EXISTS" in statement
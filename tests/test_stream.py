@@ -0,0 +1,62 @@
+import json, threading
+
+import pytest
+import requests
+
+from src.vinted import Vinted, VintedResponse
+from src.vinted.endpoints import Endpoints
+from src.vinted.stream import iter_json_items
+
+
+def split(payload: bytes, *positions: int):
+    bounds = [0, *positions, len(payload)]
+    return [payload[start:end] for start, end in zip(bounds, bounds[1:])]
+
+
+@pytest.mark.parametrize(
+    "items",
+    [
+        [123456, -7, 1.5e3, 0.25, True, None, "éà"],
+        [{"id": 1, "price": {"amount": "12.50"}}, {"id": 22, "tags": [1, 2]}],
+    ],
+)
+def test_items_split_at_every_position(items):
+    payload = json.dumps({"items": items, "pagination": {"page": 1}}).encode("utf-8")
+
+    for position in range(1, len(payload)):
+        assert list(iter_json_items(split(payload, position))) == items
+
+    assert list(iter_json_items([bytes([byte]) for byte in payload])) == items
+
+
+def test_missing_key_falls_back_to_full_document():
+    payload = json.dumps({"other": [1]}).encode("utf-8")
+
+    assert list(iter_json_items(split(payload, 3))) == []
+
+
+class BrokenResponse:
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.closed = False
+
+    def iter_content(self, chunk_size=None):
+        yield from self.chunks
+        raise requests.exceptions.ChunkedEncodingError("connection reset")
+
+    def close(self):
+        self.closed = True
+
+
+def test_mid_stream_error_is_surfaced():
+    client = Vinted.__new__(Vinted)
+    client.breakers, client._lock = {}, threading.Lock()
+
+    response = BrokenResponse([b'{"items": [{"id": 1}, {"id": ', b"2"])
+    result = VintedResponse(status_code=200)
+    items = client._iter_items(Endpoints.CATALOG_ITEMS, response, result, "items")
+
+    assert list(items) == [{"id": 1}]
+    assert result.error == "connection reset"
+    assert response.closed
+    assert list(client.breaker(Endpoints.CATALOG_ITEMS)._results) == [False]
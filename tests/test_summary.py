@@ -0,0 +1,77 @@
+import json
+from collections import Counter
+from types import SimpleNamespace
+
+from src.summary import (
+    RunSummary,
+    JsonlSummarySink,
+    init_sinks,
+    load_history,
+    detect_regressions,
+    StdoutSummarySink,
+)
+
+PARAMS = {"women": True, "only_vintage": False, "filter_by": None, "domains": ["fr"]}
+
+
+def make_client(domain, **counts):
+    return SimpleNamespace(
+        domain=domain,
+        status_counts=Counter({int(key[1:]): value for key, value in counts.items()}),
+        rate_limiter=SimpleNamespace(total_wait=1.0),
+    )
+
+
+def make_run(summary, request_rate=10.0, n_inserted=100):
+    run = summary.collect([], [], n_inserted)
+    run.request_rate = request_rate
+    run.n_unique = n_inserted
+    return run
+
+
+def test_requests_from_every_client_are_counted():
+    clients = [
+        make_client("fr", s200=10, s404=1),
+        make_client("de", s200=5),
+        make_client("fr", s200=3),
+    ]
+
+    run = RunSummary(**PARAMS).collect([], clients)
+
+    assert json.loads(run.requests) == {"fr": {"200": 13, "404": 1}, "de": {"200": 5}}
+    assert run.n_requests == 19
+    assert run.backoff_time == 3.0
+
+
+def test_stdout_sink_is_always_available(capsys):
+    sinks = init_sinks(["stdout"])
+
+    assert isinstance(sinks[0], StdoutSummarySink)
+    assert sinks[0].write(make_run(RunSummary(**PARAMS)))
+    assert json.loads(capsys.readouterr().out)["n_inserted"] == 100
+
+
+def test_history_only_compares_runs_with_the_same_params(tmp_path):
+    sink = JsonlSummarySink(str(tmp_path / "runs.jsonl"))
+
+    for women, request_rate in [(True, 10.0), (False, 50.0), (True, 12.0)]:
+        sink.write(make_run(RunSummary(**{**PARAMS, "women": women}), request_rate))
+
+    history = load_history([StdoutSummarySink(), sink], {**PARAMS, "seed": 1})
+
+    assert [row["request_rate"] for row in history] == [12.0, 10.0]
+
+
+def test_throughput_drops_are_reported():
+    history = [
+        {"request_rate": 10.0, "n_unique": 100, "n_inserted": 100},
+        {"request_rate": 12.0, "n_unique": 100, "n_inserted": 100},
+        {"request_rate": 11.0, "n_unique": 100, "n_inserted": 100},
+    ]
+
+    run = make_run(RunSummary(**PARAMS), request_rate=5.0, n_inserted=95)
+    regressions = detect_regressions(run, history)
+
+    assert len(regressions) == 1
+    assert regressions[0].startswith("request_rate")
+    assert detect_regressions(run, []) == []
@@ -0,0 +1,50 @@
+from types import SimpleNamespace
+
+from src import sweeper
+from src.sweeper import AvailabilitySweeper
+
+
+class FakeVinted:
+    def __init__(self, domain, status_code=200):
+        self.domain = domain
+        self.status_code = status_code
+        self.requested = []
+
+    def item_info(self, vinted_id):
+        self.requested.append(vinted_id)
+        return SimpleNamespace(status_code=self.status_code, data=None)
+
+
+def test_candidates_are_selected_for_the_client_domain(monkeypatch):
+    queries = []
+
+    def load_table(client, query, **kwargs):
+        queries.append(query)
+        return [{"vinted_id": "1"}, {"vinted_id": "2"}]
+
+    monkeypatch.setattr(sweeper, "load_table", load_table)
+
+    vinted_client = FakeVinted("de")
+    vinted_ids = AvailabilitySweeper(None, vinted_client, budget=2).load_candidates()
+
+    assert vinted_ids == ["1", "2"]
+    assert "= 'de'" in queries[0]
+    assert "= 'fr'" not in queries[0]
+
+
+def test_sweep_checks_candidates_with_its_own_client(monkeypatch):
+    updates = []
+
+    monkeypatch.setattr(
+        sweeper, "load_table", lambda client, query, **kwargs: [{"vinted_id": "1"}]
+    )
+    monkeypatch.setattr(
+        sweeper, "mark_checked", lambda **kwargs: updates.append(kwargs) or 1
+    )
+
+    clients = {domain: FakeVinted(domain, 404) for domain in ["fr", "de"]}
+    AvailabilitySweeper(None, clients["de"], budget=1).run()
+
+    assert clients["de"].requested == ["1"]
+    assert clients["fr"].requested == []
+    assert updates[0]["unavailable_ids"] == ["1"]
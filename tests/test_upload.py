@@ -0,0 +1,129 @@
+import pytest
+
+from src import bigquery
+from src.bigquery import upload, upload_error_kind, TRANSIENT, TOO_LARGE, FATAL
+
+
+class APIError(Exception):
+    def __init__(self, code, message=""):
+        super().__init__(f"{code} {message}")
+        self.code = code
+
+
+class FakeClient:
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = []
+
+    def insert_rows_json(self, table, json_rows):
+        self.calls.append((table, list(json_rows)))
+        outcome = self.outcomes.pop(0) if self.outcomes else []
+
+        if callable(outcome):
+            outcome = outcome(json_rows)
+        if isinstance(outcome, Exception):
+            raise outcome
+
+        return outcome
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(bigquery.time, "sleep", sleeps.append)
+    return sleeps
+
+
+def make_rows(n):
+    return [{"id": str(index)} for index in range(n)]
+
+
+@pytest.mark.parametrize(
+    "error, kind",
+    [
+        (APIError(404, "Not found: Table runs"), FATAL),
+        (APIError(403, "Access Denied"), FATAL),
+        (APIError(400, "Invalid value"), FATAL),
+        (APIError(400, "Request payload size exceeds the limit: too large"), TOO_LARGE),
+        (APIError(413), TOO_LARGE),
+        (APIError(429), TRANSIENT),
+        (APIError(503), TRANSIENT),
+        (TimeoutError(), TRANSIENT),
+        (ValueError("bad row"), FATAL),
+    ],
+)
+def test_upload_error_kind(error, kind):
+    assert upload_error_kind(error) == kind
+
+
+def test_not_found_fails_fast(sleeps):
+    client = FakeClient(APIError(404, "Not found"))
+    result = upload(client, "dataset", "runs", make_rows(500), reject_table_id=None)
+
+    assert len(client.calls) == 1
+    assert sleeps == []
+    assert result.n_success == 0
+    assert len(result.failed) == 500
+
+
+def test_not_found_after_success_fails_remaining_chunks(monkeypatch, sleeps):
+    chunks = [(make_rows(3), 30), (make_rows(3), 30), (make_rows(3), 30)]
+    monkeypatch.setattr(bigquery, "chunk_rows", lambda rows: iter(chunks))
+
+    client = FakeClient([], APIError(404, "Not found"))
+    result = upload(client, "dataset", "item", make_rows(9), reject_table_id=None)
+
+    assert len(client.calls) == 2
+    assert result.n_success == 3
+    assert len(result.failed) == 6
+
+
+def test_transient_errors_sleep_once_per_round(monkeypatch, sleeps):
+    chunks = [(make_rows(2), 20), (make_rows(2), 20), (make_rows(2), 20)]
+    monkeypatch.setattr(bigquery, "chunk_rows", lambda rows: iter(chunks))
+
+    client = FakeClient(APIError(503), APIError(503), APIError(503), [], [], [])
+    result = upload(client, "dataset", "item", make_rows(6), reject_table_id=None)
+
+    assert len(client.calls) == 6
+    assert sleeps == [bigquery.UPLOAD_RETRY_BACKOFF]
+    assert result.n_success == 6
+    assert result.backoff_time == bigquery.UPLOAD_RETRY_BACKOFF
+    assert result
+
+
+def test_transient_errors_give_up_after_max_retries(sleeps):
+    client = FakeClient(*[APIError(500)] * 10)
+    result = upload(
+        client, "dataset", "item", make_rows(4), max_retries=2, reject_table_id=None
+    )
+
+    assert len(client.calls) == 3
+    assert len(sleeps) == 2
+    assert len(result.failed) == 4
+
+
+def test_too_large_splits_without_sleeping(sleeps):
+    def insert(rows):
+        return APIError(413) if len(rows) > 2 else []
+
+    client = FakeClient(*[insert] * 10)
+    result = upload(client, "dataset", "item", make_rows(8), reject_table_id=None)
+
+    assert [len(rows) for _, rows in client.calls] == [8, 4, 4, 2, 2, 2, 2]
+    assert sleeps == []
+    assert result.n_success == 8
+
+
+def test_row_errors_retry_only_retryable_rows(sleeps):
+    first = [
+        {"index": 0, "errors": [{"reason": "invalid", "message": "bad"}]},
+        {"index": 1, "errors": [{"reason": "backendError", "message": "later"}]},
+    ]
+    client = FakeClient(first, [])
+    result = upload(client, "dataset", "item", make_rows(3), reject_table_id=None)
+
+    assert [rows for _, rows in client.calls][1] == [{"id": "1"}]
+    assert sleeps == [bigquery.UPLOAD_RETRY_BACKOFF]
+    assert result.n_success == 2
+    assert [entry["row"] for entry in result.rejected] == [{"id": "0"}]